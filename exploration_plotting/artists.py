@@ -0,0 +1,81 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    Any,
+    Sequence,
+    Tuple,
+)
+
+from matplotlib.axes import Axes
+from matplotlib.collections import LineCollection, PathCollection, PolyCollection
+import numpy as np
+
+# batched drawing of series with one element per tuning run (rewrite)
+# each series is a single collection instead of one artist per element
+# figures with thousands of rewrites spend most of their time in the overhead of single artists
+
+
+@staticmethod
+def group_points(groups: Sequence[Sequence[float]]) -> Tuple[np.ndarray, np.ndarray]:
+
+    # points of all groups, x is the index of the group
+    lengths: np.ndarray = np.array([len(group) for group in groups], dtype=np.intp)
+    x: np.ndarray = np.repeat(np.arange(len(groups)), lengths)
+    y: np.ndarray = np.concatenate([np.asarray(group, dtype=np.float64) for group in groups]) if len(groups) > 0 else np.zeros(0)
+
+    return (x, y)
+
+
+@staticmethod
+def points(ax: Axes, groups: Sequence[Sequence[float]], **kwargs: Any) -> PathCollection:
+    # all points of all groups as one scatter
+    (x, y) = group_points(groups)
+    return ax.scatter(x, y, **kwargs) # type: ignore
+
+
+@staticmethod
+def ranges(ax: Axes, x: Sequence[float], ymin: Sequence[float], ymax: Sequence[float], **kwargs: Any) -> LineCollection:
+    # one vertical segment per element
+    segments: np.ndarray = np.stack([
+        np.column_stack([x, ymin]),
+        np.column_stack([x, ymax]),
+        ], axis=1).astype(np.float64)
+
+    collection: LineCollection = LineCollection(segments, **kwargs) # type: ignore
+    ax.add_collection(collection)
+    ax.autoscale_view()
+
+    return collection
+
+
+@staticmethod
+def bars(ax: Axes,
+         x: Sequence[float],
+         height: Sequence[float],
+         bottom: Sequence[float],
+         width: float = 0.8,
+         **kwargs: Any,
+         ) -> PolyCollection:
+
+    # one rectangle per element, centered at x as for plt.bar
+    left: np.ndarray = np.asarray(x, dtype=np.float64) - width / 2
+    lower: np.ndarray = np.asarray(bottom, dtype=np.float64)
+    upper: np.ndarray = lower + np.asarray(height, dtype=np.float64)
+
+    vertices: np.ndarray = np.stack([
+        np.column_stack([left, lower]),
+        np.column_stack([left, upper]),
+        np.column_stack([left + width, upper]),
+        np.column_stack([left + width, lower]),
+        ], axis=1)
+
+    collection: PolyCollection = PolyCollection(list(vertices), **kwargs) # type: ignore
+
+    # autoscaling does not add a margin below the bars, as for plt.bar
+    collection.sticky_edges.y[:] = lower.tolist()
+    ax.add_collection(collection)
+    ax.autoscale_view()
+
+    return collection
+
@@ -0,0 +1,81 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    Dict,
+    List,
+    TYPE_CHECKING
+)
+
+if TYPE_CHECKING:
+    from plotting_configuration import PlottingConfiguration
+
+import os
+import shutil
+
+import util
+import exploration_dataset
+
+# suffix of the dataset folder while it is written
+partial_suffix: str = ".partial"
+
+
+@staticmethod
+def convert(plotting_configuration: PlottingConfiguration) -> None:
+
+    # dataset format is given by -f, parquet by default
+    format: str = "parquet"
+    if plotting_configuration.format in exploration_dataset.dataset_formats:
+        format = str(plotting_configuration.format)
+    suffix: str = exploration_dataset.dataset_formats[format]
+
+    root: str = f"{plotting_configuration.output}/{plotting_configuration.name}{suffix}"
+    print(f"converting {plotting_configuration.input} to {root}")
+
+    # written to a partial folder first and moved into place when complete
+    # (the output is inside the input tree by default, see exploration_dataset.is_partial)
+    partial: str = root + partial_suffix
+    if os.path.isdir(partial):
+        shutil.rmtree(partial)
+
+    # benchmark -> method -> runs, in the order used by all plots
+    benchmarks: Dict[str, Dict[str, List[str]]] = {}
+    for (benchmark, benchmark_path) in util.list_folders(plotting_configuration.input):
+        benchmarks[benchmark] = {}
+
+        for (method, method_path) in util.list_folders(benchmark_path):
+            runs: List[str] = util.list_runs(method_path)
+            benchmarks[benchmark][method] = runs
+
+            partition: str = os.path.join(partial, exploration_dataset.benchmark_key + benchmark, exploration_dataset.method_key + method)
+            os.makedirs(partition, exist_ok=True)
+
+            # parse the runs of a method in parallel, write them one by one
+            util.load_files([method_path], plotting_configuration.jobs)
+            for run in runs:
+                table: util.RunData = util.process_file_fully(util.get_run_folder(method_path), run)
+                exploration_dataset.write_run(table, os.path.join(partition, os.path.splitext(run)[0] + suffix), format)
+
+                # keep memory bounded by the runs of one method
+                release(util.get_run_folder(method_path), run)
+
+            print(f"    {benchmark}/{method}: {len(runs)} runs")
+
+    # written last, an incomplete dataset is never used as input
+    exploration_dataset.write_index(partial, benchmarks, format)
+
+    # replaces the dataset of a previous conversion
+    if os.path.isdir(root):
+        shutil.rmtree(root)
+    os.rename(partial, root)
+
+    return None
+
+
+@staticmethod
+def release(folder: str, run: str) -> None:
+    path: str = os.path.normpath(folder + "/" + run)
+    util.loaded_files.pop(path, None)
+    util.loaded_projections.pop(path, None)
+
+    return None
@@ -0,0 +1,163 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+)
+
+import importlib.util
+import inspect
+import warnings
+
+import numpy as np
+
+from exploration_table import ExplorationTable, numeric_columns, parse_numeric
+
+# parser backends for whole csv files, implemented in C by pyarrow or numpy
+# all backends produce the same table as the csv module (see util.read_csv_chunks)
+# a backend returns None if it cannot parse a file, the csv module is used then
+
+
+@staticmethod
+def parse_pyarrow(path: str, header: List[str], selected: List[str]) -> ExplorationTable | None:
+
+    # optional dependency, imported on first use
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.compute as pa_compute
+
+    # read all projected columns as strings, types are inferred as for the csv module
+    try:
+        table = pa_csv.read_csv(
+            path,
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=selected,
+                column_types=dict([(name, pa.string()) for name in selected]),
+                strings_can_be_null=False,
+                quoted_strings_can_be_null=False,
+                ),
+            )
+    except (pa.ArrowInvalid, ValueError):
+        return None
+
+    columns: Dict[str, np.ndarray] = {}
+    categories: Dict[str, List[str]] = {}
+    for name in selected:
+        column = table.column(name).combine_chunks()
+
+        dtype: Any = numeric_columns.get(name.strip())
+        if dtype is not None:
+            try:
+                columns[name] = pa_compute.cast(column, pa.from_numpy_dtype(dtype)).to_numpy(zero_copy_only=False)
+                continue
+            except pa.ArrowInvalid:
+                # e.g. integers written as floats, use the conversion of the csv module
+                parsed: np.ndarray | None = parse_numeric(column.to_numpy(zero_copy_only=False).astype(str), dtype)
+                if parsed is not None:
+                    columns[name] = parsed
+                    continue
+
+        # dictionary ids are assigned in order of appearance, same as intern
+        encoded = column.dictionary_encode()
+        columns[name] = encoded.indices.to_numpy(zero_copy_only=False).astype(np.int32)
+        categories[name] = encoded.dictionary.to_pylist()
+
+    return ExplorationTable(header=selected, columns=columns, categories=categories)
+
+
+@staticmethod
+def parse_numpy(path: str, header: List[str], selected: List[str]) -> ExplorationTable | None:
+
+    # numeric columns are converted by numpy while reading, all other columns are read as strings
+    numeric: List[str] = [name for name in selected if name.strip() in numeric_columns]
+    strings: List[str] = [name for name in selected if name not in numeric]
+
+    values: Dict[str, np.ndarray] = {}
+    try:
+        if len(numeric) > 0:
+            dtype: np.dtype = np.dtype([(name, numeric_columns[name.strip()]) for name in numeric])
+            try:
+                typed: np.ndarray = load_columns(path, header, numeric, dtype)
+                values.update([(name, np.ascontiguousarray(typed[name])) for name in numeric])
+            except ValueError:
+                # e.g. integers written as floats, types are inferred as for the csv module
+                strings = [name for name in selected]
+
+        if len(strings) > 0:
+            text: np.ndarray = load_columns(path, header, strings, np.dtype(str))
+            values.update([(name, text[:, index]) for (index, name) in enumerate(strings)])
+    except ValueError:
+        return None
+
+    # string columns are typed (numeric) or interned, same as for the csv module
+    table: ExplorationTable = ExplorationTable.from_columns(strings, [values[name] for name in strings])
+    for name in selected:
+        if name not in table.columns:
+            table.columns[name] = values[name]
+
+    return ExplorationTable(header=selected, columns=dict([(name, table.columns[name]) for name in selected]), categories=table.categories)
+
+
+@staticmethod
+def load_columns(path: str, header: List[str], names: List[str], dtype: np.dtype) -> np.ndarray:
+
+    # strings are returned as a 2d array, structured dtypes as a 1d array of records
+    with warnings.catch_warnings():
+        # files without samples
+        warnings.simplefilter('ignore', category=UserWarning)
+        data: np.ndarray = np.loadtxt(path, dtype=dtype, delimiter=',', quotechar='"', comments=None, skiprows=1,
+                                      usecols=[header.index(name) for name in names], ndmin=1 if dtype.names else 2)
+
+    if dtype.names is None and len(data) == 0:
+        return np.zeros((0, len(names)), dtype=dtype)
+
+    return data
+
+
+@staticmethod
+def has_pyarrow() -> bool:
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+@staticmethod
+def has_numpy() -> bool:
+    # quoted fields are supported since numpy 1.23
+    return 'quotechar' in inspect.signature(np.loadtxt).parameters
+
+
+# registered backends, from fastest to slowest, with their feature detection
+backends: Dict[str, Callable[[str, List[str], List[str]], ExplorationTable | None]] = {
+    "pyarrow": parse_pyarrow,
+    "numpy": parse_numpy,
+}
+
+available: Dict[str, Callable[[], bool]] = {
+    "pyarrow": has_pyarrow,
+    "numpy": has_numpy,
+}
+
+# backend in use, detected on first use ("csv" for the csv module only)
+backend: str | None = None
+
+
+@staticmethod
+def select_backend() -> str:
+    global backend
+
+    if backend is None:
+        backend = next((name for name in backends if available[name]()), "csv")
+
+    return backend
+
+
+@staticmethod
+def parse(path: str, header: List[str], selected: List[str]) -> ExplorationTable | None:
+
+    name: str = select_backend()
+    if name not in backends:
+        return None
+
+    return backends[name](path, header, selected)
@@ -0,0 +1,167 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    Any,
+    List,
+    Tuple,
+)
+
+from matplotlib.axes import Axes
+from matplotlib.colors import LinearSegmentedColormap, to_rgb
+from matplotlib.image import AxesImage
+from matplotlib.scale import InvertedLogTransform
+from matplotlib.transforms import Affine2D, IdentityTransform, Transform, blended_transform_factory
+import numpy as np
+import plotly.graph_objects as go # type: ignore
+
+# density binned rendering for scatter plots with many points
+# points are counted in a 2d histogram at the output resolution and drawn as one image
+# the size of the output does not depend on the number of points
+
+# upper bound of bins per axis, e.g. for figures saved with dpi=1000
+max_bins: int = 2000
+
+# size of the images written by plotly (default width and height)
+image_size: Tuple[int, int] = (700, 500)
+
+
+@staticmethod
+def get_bins(ax: Axes, dpi: float) -> Tuple[int, int]:
+
+    # pixels of the axes in the saved figure
+    (width, height) = ax.get_window_extent().size / ax.figure.dpi * dpi # type: ignore
+
+    return (int(min(max(width, 1), max_bins)), int(min(max(height, 1), max_bins)))
+
+
+@staticmethod
+def get_extent(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float, float]:
+    # bounds of the points, widened for a single distinct value
+    (left, right) = (float(np.min(x)), float(np.max(x))) if len(x) > 0 else (0.0, 1.0)
+    (bottom, top) = (float(np.min(y)), float(np.max(y))) if len(y) > 0 else (0.0, 1.0)
+
+    return (left, right if right > left else left + 1, bottom, top if top > bottom else bottom + 1)
+
+
+@staticmethod
+def histogram(x: np.ndarray,
+              y: np.ndarray,
+              bins: Tuple[int, int],
+              extent: Tuple[float, float, float, float] | None = None,
+              log_y: bool = False,
+              ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+
+    # counts (x bins x y bins) and bin edges, points outside of the extent are dropped
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # bins of equal size in log space for log scaled axes
+    if log_y:
+        positive: np.ndarray = y > 0
+        (x, y) = (x[positive], y[positive])
+
+    (left, right, bottom, top) = extent if extent is not None else get_extent(x, np.log10(y) if log_y else y)
+    if log_y and extent is not None:
+        (bottom, top) = (np.log10(bottom), np.log10(top))
+
+    x_edges: np.ndarray = np.linspace(left, right, bins[0] + 1)
+    y_edges: np.ndarray = np.linspace(bottom, top, bins[1] + 1)
+
+    (counts, _, _) = np.histogram2d(x, np.log10(y) if log_y else y, bins=(x_edges, y_edges))
+
+    return (counts, x_edges, 10 ** y_edges if log_y else y_edges)
+
+
+@staticmethod
+def density(ax: Axes,
+            x: np.ndarray,
+            y: np.ndarray,
+            color: Any,
+            dpi: float,
+            extent: Tuple[float, float, float, float] | None = None,
+            log_y: bool = False,
+            alpha: float = 0.9,
+            label: str | None = None,
+            zorder: float = 0,
+            ) -> Any:
+
+    (counts, x_edges, y_edges) = histogram(x, y, get_bins(ax, dpi), extent=extent, log_y=log_y)
+
+    # one color, the opacity grows with the (log) number of points in a bin
+    # empty bins stay transparent, so layers of several runs can be combined
+    (red, green, blue) = to_rgb(color)
+    colormap: LinearSegmentedColormap = LinearSegmentedColormap.from_list('density', [(red, green, blue, 0.5 * alpha), (red, green, blue, alpha)])
+    values: np.ndarray = np.ma.masked_equal(np.log1p(counts.T), 0)
+
+    image: AxesImage = AxesImage(ax, cmap=colormap, origin='lower', interpolation='nearest', zorder=zorder, label=label)
+    image.set_data(values)
+    image.set_transform(get_transform(ax, x_edges, y_edges, log_y))
+    image.set_clip_path(ax.patch)
+    ax.add_image(image)
+
+    # the image is placed by its transform (it has no extent), the data limits are given by the bin edges
+    # clipped to the axes, so it is not needed for the layout
+    image.set_in_layout(False)
+    ax.update_datalim([(x_edges[0], y_edges[0]), (x_edges[-1], y_edges[-1])])
+    ax.autoscale_view()
+
+    return image
+
+
+@staticmethod
+def get_transform(ax: Axes, x_edges: np.ndarray, y_edges: np.ndarray, log_y: bool) -> Transform:
+
+    # pixels of the image (centered at integers) to data coordinates
+    # for log scaled axes the rows are equal in log space, so the image is not stretched
+    # (an image with an extent in data coordinates would be, a mesh is slow to draw)
+    (bottom, top) = (np.log10(y_edges[0]), np.log10(y_edges[-1])) if log_y else (y_edges[0], y_edges[-1])
+    (width, height) = ((x_edges[-1] - x_edges[0]) / (len(x_edges) - 1), (top - bottom) / (len(y_edges) - 1))
+    pixels: Transform = Affine2D().translate(0.5, 0.5).scale(width, height).translate(x_edges[0], bottom)
+
+    if log_y:
+        pixels = pixels + blended_transform_factory(IdentityTransform(), InvertedLogTransform(10))
+
+    return pixels + ax.transData
+
+
+@staticmethod
+def scatter(ax: Axes,
+            x: np.ndarray,
+            y: np.ndarray,
+            threshold: int,
+            dpi: float,
+            extent: Tuple[float, float, float, float] | None = None,
+            log_y: bool = False,
+            **kwargs: Any,
+            ) -> Any:
+
+    # single points up to the threshold, density binned above
+    # the density is drawn below other artists unless a zorder is given
+    if len(x) <= threshold:
+        return ax.scatter(x, y, **kwargs) # type: ignore
+
+    return density(ax, x, y, color=kwargs.get('color'), dpi=dpi, extent=extent, log_y=log_y, alpha=kwargs.get('alpha', 0.9), label=kwargs.get('label'),
+                   zorder=kwargs.get('zorder', 0))
+
+
+@staticmethod
+def heatmap(x: np.ndarray,
+            y: np.ndarray,
+            colorscale: List[List[Any]],
+            log_y: bool = False,
+            name: str | None = None,
+            ) -> go.Heatmap:
+
+    # plotly version, binned at the size of the image
+    (counts, x_edges, y_edges) = histogram(x, y, bins=(min(image_size[0], max_bins), min(image_size[1], max_bins)), log_y=log_y)
+
+    # bins are centered in log space for log scaled axes, empty bins are transparent
+    return go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=np.sqrt(y_edges[:-1] * y_edges[1:]) if log_y else (y_edges[:-1] + y_edges[1:]) / 2,
+        z=np.where(counts.T > 0, np.log1p(counts.T), np.nan),
+        colorscale=colorscale,
+        showscale=False,
+        name=name,
+        )
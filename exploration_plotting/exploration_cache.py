@@ -0,0 +1,164 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    Dict,
+    List,
+    Any,
+)
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+from exploration_table import ExplorationTable, project
+
+# cache folder, created next to the csv files it caches
+cache_folder: str = ".expl_cache"
+
+# bump this whenever the layout of the cached files changes
+cache_version: int = 2
+
+
+def get_cache_path(path: str) -> str:
+    (folder, file) = os.path.split(path)
+    return os.path.join(folder, cache_folder, file)
+
+
+def get_content_hash(path: str) -> str:
+
+    # hash file in chunks to keep memory bounded
+    content_hash = hashlib.sha1()
+    with open(path, mode='rb') as ifd:
+        for chunk in iter(lambda: ifd.read(1 << 20), b''):
+            content_hash.update(chunk)
+
+    return content_hash.hexdigest()
+
+
+def is_valid(path: str, cache_path: str, meta: Dict[str, Any]) -> bool:
+
+    if meta.get('version') != cache_version:
+        return False
+
+    stat: os.stat_result = os.stat(path)
+
+    # different size, file has changed
+    if meta['size'] != stat.st_size:
+        return False
+
+    # same size and modification time, file is unchanged
+    if meta['mtime'] == stat.st_mtime_ns:
+        return True
+
+    # file was touched, check if the content has changed
+    if meta['hash'] != get_content_hash(path):
+        return False
+
+    # content is the same, remember new modification time
+    meta['mtime'] = stat.st_mtime_ns
+    try:
+        write_meta(cache_path, meta)
+    except OSError:
+        pass
+
+    return True
+
+
+def load(path: str, columns: List[str] | None = None) -> ExplorationTable | None:
+
+    cache_path: str = get_cache_path(path)
+    try:
+        with open(os.path.join(cache_path, 'meta.json'), mode='r') as ifd:
+            meta: Dict[str, Any] = json.load(ifd)
+
+        if not is_valid(path, cache_path, meta):
+            return None
+
+        # the entry might only hold some columns of the file
+        stored: List[str] = meta['header']
+        header: List[str] = project(meta['file_header'], columns)
+        if any([name not in stored for name in header]):
+            return None
+
+        with open(os.path.join(cache_path, 'categories.json'), mode='r') as ifd:
+            categories: Dict[str, List[str]] = json.load(ifd)
+
+        # columns are memory mapped and only read when accessed
+        data: Dict[str, np.ndarray] = {}
+        for name in header:
+            data[name] = np.asarray(np.load(os.path.join(cache_path, f"{stored.index(name)}.npy"), mmap_mode='r'))
+
+    except (OSError, ValueError, KeyError):
+        return None
+
+    return ExplorationTable(
+        header=header,
+        columns=data,
+        categories=dict([(name, values) for (name, values) in categories.items() if name in data]),
+    )
+
+
+def get_columns(path: str) -> List[str]:
+
+    # stripped names of the columns held by a valid entry, empty if there is none
+    cache_path: str = get_cache_path(path)
+    try:
+        with open(os.path.join(cache_path, 'meta.json'), mode='r') as ifd:
+            meta: Dict[str, Any] = json.load(ifd)
+
+        if not is_valid(path, cache_path, meta):
+            return []
+
+        return [name.strip() for name in meta['header']]
+
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+def store(path: str, table: ExplorationTable, file_header: List[str]) -> None:
+
+    cache_path: str = get_cache_path(path)
+    try:
+        # remove outdated entry
+        if os.path.isdir(cache_path):
+            shutil.rmtree(cache_path)
+        os.makedirs(cache_path)
+
+        stat: os.stat_result = os.stat(path)
+
+        for (index, name) in enumerate(table.header):
+            np.save(os.path.join(cache_path, f"{index}.npy"), np.ascontiguousarray(table.columns[name]))
+
+        with open(os.path.join(cache_path, 'categories.json'), mode='w') as ofd:
+            json.dump(table.categories, ofd)
+
+        # meta data is written last and marks the entry as complete
+        write_meta(cache_path, {
+            'version': cache_version,
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'hash': get_content_hash(path),
+            'header': table.header,
+            'file_header': file_header,
+        })
+
+    except OSError:
+        # caching is optional, e.g. for read only result folders
+        pass
+
+    return None
+
+
+def write_meta(cache_path: str, meta: Dict[str, Any]) -> None:
+
+    # write to temporary file first, so readers never see a partial file
+    meta_path: str = os.path.join(cache_path, 'meta.json')
+    with open(meta_path + '.tmp', mode='w') as ofd:
+        json.dump(meta, ofd)
+    os.replace(meta_path + '.tmp', meta_path)
+
+    return None
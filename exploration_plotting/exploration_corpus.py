@@ -0,0 +1,122 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    Dict,
+    List,
+    Tuple,
+    Iterator,
+)
+
+from collections.abc import Mapping, MutableMapping
+
+import util
+
+# lazy view on a folder of explorations
+# the directory tree is indexed up front, csv files are parsed on first access
+
+
+class MethodRuns(MutableMapping[str, util.RunData]):
+    """
+    Runs (csv files) of one method folder, parsed on first access.
+    """
+
+    def __init__(self, path: str, jobs: int = 1, columns: List[str] | None = None) -> None:
+        self.path: str = path
+        self.jobs: int = jobs
+
+        # columns parsed from the csv files (None for all columns)
+        self.columns: List[str] | None = columns
+
+        # csv files of the method, in the order used by all plots
+        self.files: List[str] = util.list_runs(path)
+        self.runs: Dict[str, util.RunData] = {}
+
+    def __getitem__(self, key: str) -> util.RunData:
+        if key not in self.runs:
+            if key not in self.files:
+                raise KeyError(key)
+
+            # first access to the method, parse its files in parallel if requested
+            util.load_files([self.path], self.jobs, self.columns)
+            self.runs[key] = util.process_file_fully(util.get_run_folder(self.path), key, self.columns)
+
+        return self.runs[key]
+
+    def __setitem__(self, key: str, value: util.RunData) -> None:
+        if key not in self.files:
+            self.files.append(key)
+        self.runs[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        self.files.remove(key)
+        self.runs.pop(key, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.files))
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __repr__(self) -> str:
+        return f"MethodRuns(path={self.path}, runs={len(self.files)}, loaded={len(self.runs)})"
+
+
+class ExplorationCorpus(Mapping[str, util.ExplorationData]):
+    """
+    Index of an input folder with one exploration (benchmark) per sub folder.
+    Benchmarks and methods are indexed up front, runs are parsed on first access.
+    """
+
+    def __init__(self, input: str, jobs: int = 1, columns: List[str] | None = None) -> None:
+        self.input: str = input
+        self.jobs: int = jobs
+        self.columns: List[str] | None = columns
+
+        # for each exploration folder in the input folder
+        explorations: List[Tuple[str, str]] = util.list_folders(input)
+
+        self.benchmarks: Dict[str, util.ExplorationData] = {}
+        for (name, path) in explorations:
+            self.benchmarks[name] = index_exploration(path, jobs, columns)
+
+    def load(self) -> None:
+        # parse all runs at once, e.g. for plots that use the whole corpus
+        # with multiple jobs, the files of all methods are parsed together in worker processes
+        paths: List[str] = [method_data.path for data in self.benchmarks.values() for (_, method_data) in data.values() if isinstance(method_data, MethodRuns)]
+        util.load_files(paths, self.jobs, self.columns)
+
+        # access each run once, runs parsed by the workers are taken over, all others are parsed here
+        for data in self.benchmarks.values():
+            for (_, method_data) in data.values():
+                for run in method_data:
+                    method_data[run]
+
+        return None
+
+    def __getitem__(self, key: str) -> util.ExplorationData:
+        return self.benchmarks[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.benchmarks)
+
+    def __len__(self) -> int:
+        return len(self.benchmarks)
+
+    def __repr__(self) -> str:
+        return f"ExplorationCorpus(input={self.input}, benchmarks={list(self.benchmarks.keys())})"
+
+
+@staticmethod
+def index_exploration(input: str, jobs: int = 1, columns: List[str] | None = None) -> util.ExplorationData:
+
+    # get method folders from input folder, sorted by their generation time
+    folders: List[Tuple[str, str]] = util.list_folders(input)
+
+    data: util.ExplorationData = {}
+    counter: int = 0
+    for (name, path) in folders:
+        data[name] = (counter, MethodRuns(path, jobs, columns))
+        counter += 1
+
+    return data
@@ -0,0 +1,203 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    Dict,
+    List,
+    Tuple,
+    Any,
+)
+
+import json
+import os
+
+import numpy as np
+
+from exploration_table import ExplorationTable, project
+
+# typed dataset of a converted results tree (see convert)
+# hive partitioned, one file per run: <root>/benchmark=<name>/method=<name>/<run>.<format>
+# runs keep the names of their csv files, so a dataset can be used as input instead of the tree
+# typed runs (arrow ipc, feather, parquet) are also read next to the csv files of a method
+
+# index file in the root of a dataset, keeps the order of benchmarks, methods and runs
+index_file: str = "_exploration_dataset.json"
+
+# bump this whenever the layout of the dataset changes
+dataset_version: int = 1
+
+# file formats, arrow (ipc) files are not compressed and can be memory mapped
+dataset_formats: Dict[str, str] = {
+    "parquet": ".parquet",
+    "arrow": ".arrow",
+}
+
+# suffixes of typed runs, also accepted next to (or instead of) the csv files of a method
+# feather (v2) files are arrow ipc files
+stored_suffixes: List[str] = [".arrow", ".feather", ".parquet"]
+
+benchmark_key: str = "benchmark="
+method_key: str = "method="
+
+
+@staticmethod
+def is_dataset(folder: str) -> bool:
+    return os.path.isfile(os.path.join(folder, index_file))
+
+
+@staticmethod
+def is_partial(folder: str) -> bool:
+    # partitions without an index, e.g. of an interrupted conversion
+    return not is_dataset(folder) and any([f.is_dir() and f.name.startswith(benchmark_key) for f in os.scandir(folder)])
+
+
+@staticmethod
+def read_index(root: str) -> Dict[str, Any]:
+    with open(os.path.join(root, index_file), mode='r') as ifd:
+        return json.load(ifd)
+
+
+@staticmethod
+def list_folders(folder: str) -> List[Tuple[str, str]] | None:
+
+    # benchmarks of a dataset root or methods of a benchmark partition, in their original order
+    # None if the folder is not part of a dataset
+    if is_dataset(folder):
+        index: Dict[str, Any] = read_index(folder)
+        return [(name, os.path.join(folder, benchmark_key + name)) for name in index['benchmarks']]
+
+    (root, partition) = os.path.split(os.path.normpath(folder))
+    if partition.startswith(benchmark_key) and is_dataset(root):
+        methods: Dict[str, List[str]] = read_index(root)['benchmarks'][partition[len(benchmark_key):]]
+        return [(name, os.path.join(folder, method_key + name)) for name in methods]
+
+    return None
+
+
+@staticmethod
+def list_runs(folder: str) -> List[str] | None:
+
+    # runs (names of the csv files) of a method partition, None if the folder is not part of a dataset
+    (benchmark_folder, method_partition) = os.path.split(os.path.normpath(folder))
+    (root, benchmark_partition) = os.path.split(benchmark_folder)
+    if not method_partition.startswith(method_key) or not is_dataset(root):
+        return None
+
+    benchmarks: Dict[str, Dict[str, List[str]]] = read_index(root)['benchmarks']
+    return benchmarks[benchmark_partition[len(benchmark_key):]][method_partition[len(method_key):]]
+
+
+@staticmethod
+def resolve_exploration(folder: str) -> str:
+
+    # a dataset with a single benchmark can be used as input for plots of one exploration
+    if not is_dataset(folder):
+        return folder
+
+    benchmarks: List[Tuple[str, str]] = list_folders(folder) or []
+    if len(benchmarks) != 1:
+        raise ValueError(f"dataset {folder} contains {len(benchmarks)} benchmarks, use {folder}/{benchmark_key}<name> as input")
+
+    return benchmarks[0][1]
+
+
+@staticmethod
+def get_stored_path(path: str) -> str | None:
+
+    # typed file of a run, given the path of its csv file
+    # used unless the csv file is newer (e.g. the exploration was continued)
+    (stem, _) = os.path.splitext(path)
+    for suffix in stored_suffixes:
+        if os.path.isfile(stem + suffix):
+            if not os.path.isfile(path) or os.path.getmtime(stem + suffix) >= os.path.getmtime(path):
+                return stem + suffix
+
+    return None
+
+
+@staticmethod
+def is_memory_mapped(path: str) -> bool:
+    # typed run that is memory mapped instead of parsed
+    stored: str | None = get_stored_path(path)
+    return stored is not None and not stored.endswith(dataset_formats["parquet"])
+
+
+@staticmethod
+def list_stored_runs(folder: str) -> List[str]:
+    # typed runs in a csv folder, named by their csv files
+    return [os.path.splitext(f)[0] + ".csv" for f in os.listdir(folder) if os.path.splitext(f)[1] in stored_suffixes]
+
+
+@staticmethod
+def write_index(root: str, benchmarks: Dict[str, Dict[str, List[str]]], format: str) -> None:
+    with open(os.path.join(root, index_file), mode='w') as ofd:
+        json.dump({'version': dataset_version, 'format': format, 'benchmarks': benchmarks}, ofd, indent=2)
+
+    return None
+
+
+@staticmethod
+def write_run(table: ExplorationTable, path: str, format: str) -> None:
+
+    # optional dependency, imported on first use
+    import pyarrow as pa
+
+    # numeric columns keep their type, categorical columns are stored as dictionaries
+    arrays: List[Any] = []
+    for name in table.header:
+        if name in table.categories:
+            arrays.append(pa.DictionaryArray.from_arrays(
+                pa.array(table.columns[name], type=pa.int32()),
+                pa.array(table.categories[name], type=pa.string()),
+                ))
+        else:
+            arrays.append(pa.array(table.columns[name]))
+
+    arrow_table = pa.Table.from_arrays(arrays, names=table.header)
+
+    if format == "parquet":
+        import pyarrow.parquet as pa_parquet
+        pa_parquet.write_table(arrow_table, path, compression='zstd')
+    else:
+        with pa.OSFile(path, mode='wb') as ofd:
+            with pa.ipc.new_file(ofd, arrow_table.schema) as writer:
+                writer.write_table(arrow_table)
+
+    return None
+
+
+@staticmethod
+def read_run(path: str, columns: List[str] | None = None) -> ExplorationTable:
+
+    # optional dependency, imported on first use
+    import pyarrow as pa
+
+    # only the projected columns are read from the file
+    if path.endswith(dataset_formats["parquet"]):
+        import pyarrow.parquet as pa_parquet
+        header: List[str] = pa_parquet.read_schema(path).names
+        arrow_table = pa_parquet.read_table(path, columns=project(header, columns))
+    else:
+        # arrow ipc files are memory mapped, uncompressed columns are not copied
+        # the mapping is kept alive by the arrays, pages are shared between processes
+        arrow_table = pa.ipc.open_file(pa.memory_map(path, mode='r')).read_all()
+        header = arrow_table.schema.names
+        arrow_table = arrow_table.select(project(header, columns))
+
+    # row groups might come with different dictionaries (files with a single batch are not copied)
+    if any([column.num_chunks > 1 for column in arrow_table.columns]):
+        arrow_table = arrow_table.unify_dictionaries().combine_chunks()
+
+    typed: Dict[str, np.ndarray] = {}
+    categories: Dict[str, List[str]] = {}
+    for name in arrow_table.schema.names:
+        column = arrow_table.column(name)
+        array = column.chunk(0) if column.num_chunks > 0 else pa.array([], type=column.type)
+
+        if pa.types.is_dictionary(array.type):
+            typed[name] = array.indices.to_numpy(zero_copy_only=False).astype(np.int32, copy=False)
+            categories[name] = array.dictionary.to_pylist()
+        else:
+            typed[name] = array.to_numpy(zero_copy_only=False)
+
+    return ExplorationTable(header=arrow_table.schema.names, columns=typed, categories=categories)
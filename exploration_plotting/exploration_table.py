@@ -0,0 +1,343 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Tuple,
+    Iterator,
+    Sequence,
+    Union,
+    Any,
+)
+
+from collections.abc import Mapping
+
+import numpy as np
+
+import segments
+
+# columns with a fixed numeric type
+# all other columns are stored as interned strings (categorical codes)
+numeric_columns: Dict[str, Any] = {
+    'runtime': np.float64,
+    'timestamp': np.int64,
+    'executions': np.int32,
+}
+
+
+class ExplorationTable:
+    """
+    Columnar storage for the samples of one exploration run (one csv file).
+    """
+
+    def __init__(self,
+                 header: List[str],
+                 columns: Dict[str, np.ndarray],
+                 categories: Dict[str, List[str]],
+                 ) -> None:
+
+        # header as given in the csv file (e.g. 'executions ' with trailing space)
+        self.header: List[str] = header
+
+        # one array per column, categorical columns hold codes into categories
+        self.columns: Dict[str, np.ndarray] = columns
+        self.categories: Dict[str, List[str]] = categories
+
+        # lookup from stripped column names to the names in the header
+        self.names: Dict[str, str] = dict([(name.strip(), name) for name in header])
+
+        # segmentation into tuning runs, computed on first use
+        self._group_starts: np.ndarray | None = None
+        self._segments: segments.Segments | None = None
+
+    @staticmethod
+    def from_rows(header: List[str], rows: List[List[str]], columns: List[str] | None = None) -> ExplorationTable:
+
+        # transpose rows to columns, only the projected columns (names as in the header) are decoded
+        if columns is None:
+            selected: List[str] = header
+            values: List[Sequence[str]] = list(zip(*rows)) if len(rows) > 0 else [() for _ in header]
+        else:
+            selected = [name for name in header if name in columns]
+            values = [[row[header.index(name)] for row in rows] for name in selected]
+
+        return ExplorationTable.from_columns(selected, values)
+
+    @staticmethod
+    def from_columns(header: List[str], values: Sequence[Sequence[str]]) -> ExplorationTable:
+
+        # columns of strings (lists or numpy string arrays), e.g. from a parser backend
+        typed: Dict[str, np.ndarray] = {}
+        categories: Dict[str, List[str]] = {}
+        for (name, column) in zip(header, values):
+
+            # try typed conversion first, fall back to interned strings
+            dtype: Any = numeric_columns.get(name.strip())
+            if dtype is not None:
+                parsed: np.ndarray | None = parse_numeric(column, dtype)
+                if parsed is not None:
+                    typed[name] = parsed
+                    continue
+
+            (typed[name], categories[name]) = intern(column)
+
+        return ExplorationTable(header=header, columns=typed, categories=categories)
+
+    # typed columns
+    @property
+    def runtime(self) -> np.ndarray:
+        return self.columns[self.names['runtime']]
+
+    @property
+    def timestamp(self) -> np.ndarray:
+        return self.columns[self.names['timestamp']]
+
+    @property
+    def executions(self) -> np.ndarray:
+        return self.columns[self.names['executions']]
+
+    @property
+    def error_level(self) -> np.ndarray:
+        return self.columns[self.names['error-level']]
+
+    @property
+    def rewrite(self) -> np.ndarray:
+        return self.columns[self.names['rewrite']]
+
+    # segmentation into tuning runs
+    @property
+    def group_starts(self) -> np.ndarray:
+        # start offset of each tuning run, a new group starts whenever the rewrite changes
+        if self._group_starts is None:
+            rewrite: np.ndarray = self.rewrite
+            if len(rewrite) == 0:
+                self._group_starts = np.zeros(0, dtype=np.intp)
+            else:
+                self._group_starts = np.concatenate(([0], np.flatnonzero(rewrite[1:] != rewrite[:-1]) + 1))
+
+        return self._group_starts
+
+    @property
+    def segments(self) -> segments.Segments:
+        # per tuning run reductions over the runtime, kept with the run
+        if self._segments is None:
+            self._segments = segments.Segments(self.runtime, self.group_starts)
+
+        return self._segments
+
+    @property
+    def group_ends(self) -> np.ndarray:
+        return np.append(self.group_starts[1:], len(self))
+
+    def groups(self) -> List[ExplorationTable]:
+        # tuning runs as slices of the table (no copy)
+        return [self.take(slice(start, end)) for (start, end) in zip(self.group_starts.tolist(), self.group_ends.tolist())]
+
+    def reduce_groups(self, ufunc: np.ufunc, values: np.ndarray) -> np.ndarray:
+        # reduce a per sample array to one value per tuning run, e.g. np.minimum
+        if len(values) == 0:
+            return np.zeros(0, dtype=values.dtype)
+
+        return ufunc.reduceat(values, self.group_starts)
+
+    def code(self, name: str, value: str) -> int:
+        # code of a categorical value, -1 if the value does not occur
+        categories: List[str] = self.categories[self.names[name]]
+        return categories.index(value) if value in categories else -1
+
+    def is_error_level(self, value: str) -> np.ndarray:
+        return self.error_level == self.code('error-level', value)
+
+    def equals(self, name: str, value: str) -> np.ndarray:
+        # mask of samples where a column has the given value
+        key: str = self.names.get(name, name)
+        if key in self.categories:
+            categories: List[str] = self.categories[key]
+            return self.columns[key] == (categories.index(value) if value in categories else -1)
+
+        return np.array(self.decode(key), dtype=str) == value
+
+    def matches(self, name: str, predicate: Callable[[str], bool]) -> np.ndarray:
+        # mask of samples where the predicate holds for a column, evaluated once per category
+        key: str = self.names.get(name, name)
+        if key in self.categories:
+            lookup: np.ndarray = np.array([predicate(value) for value in self.categories[key]], dtype=bool)
+            return lookup[self.columns[key]] if len(lookup) > 0 else np.zeros(len(self), dtype=bool)
+
+        return np.array([predicate(str(value)) for value in self.decode(key)], dtype=bool)
+
+    def numeric(self, name: str) -> np.ndarray:
+        # column as float array, also for columns stored as strings
+        key: str = self.names.get(name, name)
+        if key in self.categories:
+            categories: np.ndarray = np.array(self.categories[key], dtype=np.float64)
+            return categories[self.columns[key]]
+
+        return np.asarray(self.columns[key], dtype=np.float64)
+
+    def decode(self, name: str) -> List[Any]:
+        # decode a full column, e.g. for writing it back to a file
+        key: str = self.names.get(name, name)
+        if key in self.categories:
+            categories: List[str] = self.categories[key]
+            return [categories[code] for code in self.columns[key]]
+
+        return self.columns[key].tolist()
+
+    def value(self, name: str, index: int) -> Any:
+        key: str = self.names.get(name, name)
+        if key in self.categories:
+            return self.categories[key][self.columns[key][index]]
+
+        return self.columns[key][index].item()
+
+    def take(self, indices: Union[slice, np.ndarray]) -> ExplorationTable:
+        # slices are views on the arrays, categories are shared
+        return ExplorationTable(
+            header=self.header,
+            columns=dict([(name, column[indices]) for (name, column) in self.columns.items()]),
+            categories=self.categories,
+        )
+
+    @staticmethod
+    def concatenate(tables: List[ExplorationTable]) -> ExplorationTable:
+        # slices of the same run share their categories and are simply appended
+        # other tables (e.g. chunks of a file) get their categorical codes merged
+        columns: Dict[str, np.ndarray] = {}
+        categories: Dict[str, List[str]] = {}
+        for name in tables[0].header:
+
+            shared: List[str] | None = tables[0].categories.get(name)
+            if all([table.categories.get(name) is shared for table in tables]):
+                columns[name] = np.concatenate([table.columns[name] for table in tables])
+                if shared is not None:
+                    categories[name] = shared
+                continue
+
+            (columns[name], categories[name]) = merge_categories([table.column_codes(name) for table in tables])
+
+        return ExplorationTable(header=tables[0].header, columns=columns, categories=categories)
+
+    def column_codes(self, name: str) -> Tuple[np.ndarray, List[str]]:
+        # column as categorical codes, numeric columns are converted to strings
+        if name in self.categories:
+            return (self.columns[name], self.categories[name])
+
+        return intern([str(value) for value in self.columns[name].tolist()])
+
+    def __len__(self) -> int:
+        if len(self.columns) == 0:
+            return 0
+        return len(next(iter(self.columns.values())))
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return self.take(index)
+
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError(f"sample index out of range: {index}")
+
+        return ExplorationSample(self, index)
+
+    def __iter__(self) -> Iterator[ExplorationSample]:
+        for index in range(len(self)):
+            yield ExplorationSample(self, index)
+
+    def __repr__(self) -> str:
+        return f"ExplorationTable(samples={len(self)}, columns={self.header})"
+
+
+class ExplorationSample(Mapping[str, Any]):
+    """
+    Dict-like view on a single sample of an exploration table.
+    Compatibility for code working on the former list of dicts.
+    """
+
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table: ExplorationTable, index: int) -> None:
+        self.table: ExplorationTable = table
+        self.index: int = index
+
+    def __getitem__(self, key: str) -> Any:
+        if self.table.names.get(key, key) not in self.table.columns:
+            raise KeyError(key)
+        return self.table.value(key, self.index)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table.header)
+
+    def __len__(self) -> int:
+        return len(self.table.header)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+def project(header: List[str], columns: List[str] | None) -> List[str]:
+
+    # header names of a projection given by stripped column names
+    if columns is None:
+        return header
+
+    # runtime (last column containing 'runtime') and the validity column after it are always kept
+    runtime_index: int = max([index for (index, name) in enumerate(header) if 'runtime' in name], default=0)
+    required: List[int] = [runtime_index, runtime_index + 1]
+
+    return [name for (index, name) in enumerate(header) if name.strip() in columns or index in required]
+
+
+def parse_numeric(values: Sequence[str], dtype: Any) -> np.ndarray | None:
+
+    # conversion from strings is done by numpy
+    try:
+        return np.array(values, dtype=dtype)
+    except ValueError:
+        pass
+
+    # integers might be written as floats, e.g. '1.0'
+    try:
+        return np.array(values, dtype=np.float64).astype(dtype)
+    except ValueError:
+        return None
+
+
+def intern(values: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+
+    # assign an id to each distinct value in order of appearance
+    if isinstance(values, np.ndarray):
+        return intern_array(values)
+
+    ids: Dict[str, int] = {}
+    codes: np.ndarray = np.fromiter((ids.setdefault(value, len(ids)) for value in values), dtype=np.int32, count=len(values))
+
+    return (codes, list(ids.keys()))
+
+
+def intern_array(values: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+
+    # same codes as intern, computed by sorting instead of a python loop
+    (unique, first, inverse) = np.unique(values, return_index=True, return_inverse=True)
+
+    # renumber the sorted values by their first appearance
+    order: np.ndarray = np.argsort(first, kind='stable')
+    rank: np.ndarray = np.empty(len(order), dtype=np.int32)
+    rank[order] = np.arange(len(order), dtype=np.int32)
+
+    return (rank[inverse.reshape(-1)], [str(value) for value in unique[order].tolist()])
+
+
+def merge_categories(parts: List[Tuple[np.ndarray, List[str]]]) -> Tuple[np.ndarray, List[str]]:
+
+    # map the codes of each part to the union of all categories
+    ids: Dict[str, int] = {}
+    merged: List[np.ndarray] = []
+    for (codes, categories) in parts:
+        lookup: np.ndarray = np.array([ids.setdefault(value, len(ids)) for value in categories], dtype=np.int32)
+        merged.append(lookup[codes] if len(codes) > 0 else np.zeros(0, dtype=np.int32))
+
+    return (np.concatenate(merged), list(ids.keys()))
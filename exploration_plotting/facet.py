@@ -7,6 +7,7 @@ if TYPE_CHECKING:
     from plotting_configuration import PlottingConfiguration
 
 import util
+import performance_evolution_kernel
 
 import numpy as np
 
@@ -18,7 +19,7 @@ import matplotlib.pyplot as plt
 
 
 def facet_plot(plotting_configuration: PlottingConfiguration) -> None:
-    data = util.get_data_fully(plotting_configuration.input)
+    data = util.get_data_fully(plotting_configuration.input, plotting_configuration.jobs, ['runtime', 'rewrite', 'error-level'])
 
     # Create subplots with shared x-axis
     for method in data:
@@ -40,23 +41,15 @@ def facet_plot(plotting_configuration: PlottingConfiguration) -> None:
                 # preprocess
 
                 # convert to performance evolution
-                pe = []
-
-                minimum = float(group[0]['runtime'])
-
-                for elem in group:
-                    if elem['error-level'] == 'None':
-                        if float(elem['runtime']) < minimum:
-                            minimum = float(elem['runtime'])
-
-                    if plotting_configuration.log:
-                        pe.append(np.log10(minimum))
-                    else:
-                        pe.append(minimum)
+                pe = performance_evolution_kernel.performance_evolution(
+                    runtime=group.runtime,
+                    invalid=~group.is_error_level('None'),
+                    log=plotting_configuration.log,
+                    )
 
                 group_conter += 1
                 # Add traces to the subplots
-                x = list(range(len(group)))
+                x = np.arange(len(group))
                 y = pe
 
                 # if group_conter % 10 == 0:
@@ -65,10 +58,10 @@ def facet_plot(plotting_configuration: PlottingConfiguration) -> None:
                 fig.add_trace(go.Scatter(x=x, y=y, mode='lines'), row=1, col=group_conter)
 
                 # get max and min of pe
-                if global_max < max(pe):
-                    global_max = max(pe)
-                if global_min > min(pe):
-                    global_min = min(pe)
+                if global_max < np.nanmax(pe):
+                    global_max = np.nanmax(pe)
+                if global_min > np.nanmin(pe):
+                    global_min = np.nanmin(pe)
 
     # Update layout
     fig.update_layout(height=1000, width=2000,
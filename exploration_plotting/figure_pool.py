@@ -0,0 +1,68 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    Any,
+    Callable,
+    List,
+    Sequence,
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:
+    from plotting_configuration import PlottingConfiguration
+
+from concurrent.futures import Future, ProcessPoolExecutor
+
+import matplotlib
+from matplotlib import pyplot as plt
+
+# rendering of independent figures in worker processes
+# plots compute the data of all figures first, then each figure is drawn and written by a render function
+# a render function takes the plotting configuration and the data of one figure, it has to be picklable
+# (a module level function without staticmethod) and the data has to be picklable (arrays, lists, dicts)
+
+
+@staticmethod
+def render(plotting_configuration: PlottingConfiguration,
+           function: Callable[..., None],
+           figures: Sequence[Sequence[Any]],
+           ) -> None:
+
+    # without multiple jobs, figures are rendered one by one in this process
+    if plotting_configuration.jobs <= 1 or len(figures) <= 1:
+        for arguments in figures:
+            render_figure(function, plotting_configuration, arguments)
+
+        return None
+
+    # one figure per task, figures are written concurrently by the workers
+    with ProcessPoolExecutor(max_workers=min(plotting_configuration.jobs, len(figures)), initializer=init_worker) as executor:
+        futures: List[Future[None]] = [executor.submit(render_figure, function, plotting_configuration, arguments) for arguments in figures]
+
+        # in order of the figures, errors of a render function are raised here
+        for future in futures:
+            future.result()
+
+    return None
+
+
+# no staticmethod, has to be picklable for worker processes
+def render_figure(function: Callable[..., None], plotting_configuration: PlottingConfiguration, arguments: Sequence[Any]) -> None:
+
+    function(plotting_configuration, *arguments)
+
+    # render functions create their own figures, they are not used afterwards
+    plt.close('all')
+
+    return None
+
+
+# no staticmethod, has to be picklable for worker processes
+def init_worker() -> None:
+
+    # figures are only written to files, figures inherited from the parent process are dropped
+    matplotlib.use('Agg')
+    plt.close('all')
+
+    return None
@@ -15,15 +15,16 @@ from matplotlib import pyplot as plt
 from matplotlib.ticker import FuncFormatter
 import numpy as np
 
-from scipy.stats import sem # type: ignore
-
 import util
+import performance_evolution_kernel
 
 @staticmethod
 def performance_evolution(plotting_configuration: PlottingConfiguration) -> None:
 
-    exploration_data: util.ExplorationDataRuntime = util.get_data(
-        input=plotting_configuration.input
+    exploration_data: util.ExplorationData = util.get_data_fully(
+        input=plotting_configuration.input,
+        jobs=plotting_configuration.jobs,
+        columns=util.runtime_columns,
         )
 
     performance_evolution_plot(plotting_configuration=plotting_configuration, 
@@ -36,8 +37,8 @@ def performance_evolution(plotting_configuration: PlottingConfiguration) -> None
 
 @staticmethod
 def performance_evolution_plot(plotting_configuration: PlottingConfiguration, 
-                               exploration_data: util.ExplorationDataRuntime,
-                               plotting: Callable[[PlottingConfiguration, str, util.MethodDataRuntime, str], None],
+                               exploration_data: util.ExplorationData,
+                               plotting: Callable[[PlottingConfiguration, str, util.MethodData, str], None],
                                ) -> None: 
 
     plt.figure( # type: ignore
@@ -70,10 +71,10 @@ def performance_evolution_plot(plotting_configuration: PlottingConfiguration,
 
         if plotting_configuration.log:
             expert: float = np.log10(
-                plotting_configuration.expert if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                plotting_configuration.expert if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                     plotting_configuration.expert))
         else:
-            expert: float= plotting_configuration.expert if plotting_configuration.unit == 'runtime' else util.get_gflops(
+            expert: float= plotting_configuration.expert if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                 plotting_configuration.expert)
 
         plt.axhline(y=expert, color='black', linestyle='-', label='Expert', alpha=0.5) # type: ignore 
@@ -83,10 +84,10 @@ def performance_evolution_plot(plotting_configuration: PlottingConfiguration,
 
         if plotting_configuration.log:
             default: float = np.log10(
-                plotting_configuration.default if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                plotting_configuration.default if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                     plotting_configuration.default))
         else:
-            default: float = plotting_configuration.default if plotting_configuration.unit == 'runtime' else util.get_gflops(
+            default: float = plotting_configuration.default if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                 plotting_configuration.default)
 
         plt.axhline(y=default, color='black', linestyle='-', label='Default', alpha=0.5) # type: ignore 
@@ -104,9 +105,8 @@ def performance_evolution_plot(plotting_configuration: PlottingConfiguration,
     if plotting_configuration.log:
         log_appendix = "_log"
 
-    plt.savefig( # type: ignore
-        f"{plotting_configuration.output}/{plotting_configuration.name}_{(str(plotting).split('_')[-1]).split(' ')[0]}{log_appendix}.{plotting_configuration.format}",
-        dpi=plotting_configuration.dpi)
+    plotting_configuration.savefig(
+        f"{plotting_configuration.output}/{plotting_configuration.name}_{(str(plotting).split('_')[-1]).split(' ')[0]}{log_appendix}.{plotting_configuration.format}")
 
     return None
 
@@ -114,39 +114,19 @@ def performance_evolution_plot(plotting_configuration: PlottingConfiguration,
 @staticmethod
 def performance_evolution_method_separate(plotting_configuration: PlottingConfiguration,
                                           method_key: str,
-                                          method_data: util.MethodDataRuntime,
+                                          method_data: util.MethodData,
                                           color: str
                                           )-> None:
 
-    # get runtimes from individual runs of method 
-    data_internal: Dict[str, List[float]] = {}
+    # convert runs of method to performance evolution
+    data_internal: Dict[str, np.ndarray] = {}
     for key in method_data:
-        internal: List[float]  = []
-        for elem in method_data[key]:
-            internal.append(elem[1])
-
-        data_internal[key] = internal
-
-    # convert data to represent performance evolution
-    for key in data_internal:
-        pe: List[float] = []
-        minimum: float = data_internal[key][0]
-        for elem in data_internal[key]:
-            if elem < minimum:
-                minimum = elem
-
-            if plotting_configuration.log:
-                if plotting_configuration.unit == "gflops":
-                    pe.append(np.log10(util.get_gflops(minimum)))
-                else:
-                    pe.append(np.log10(minimum))
-            else:
-                if plotting_configuration.unit == "gflops":
-                    pe.append(util.get_gflops(minimum))
-                else:
-                    pe.append(minimum)
-
-        data_internal[key] = pe
+        data_internal[key] = performance_evolution_kernel.performance_evolution(
+            runtime=method_data[key].runtime,
+            invalid=util.get_invalid(method_data[key]),
+            log=plotting_configuration.log,
+            unit=plotting_configuration.unit,
+            )
 
     # create one pe graph for each run in method 
     counter: int = 0
@@ -154,8 +134,8 @@ def performance_evolution_method_separate(plotting_configuration: PlottingConfig
     for run in data_internal:
 
         # create x-axis and y-axis for plot 
-        x: List[int] = list(range(len(data_internal[run])))
-        y: List[float] = data_internal[run]
+        x: np.ndarray = np.arange(len(data_internal[run]))
+        y: np.ndarray = data_internal[run]
 
         # cut x and y if necessary
         if plotting_configuration.limit:
@@ -179,66 +159,27 @@ def performance_evolution_method_separate(plotting_configuration: PlottingConfig
 @staticmethod
 def performance_evolution_method_means(plotting_configuration: PlottingConfiguration, 
                                        method_key: str, 
-                                       method_data: util.MethodDataRuntime, 
+                                       method_data: util.MethodData, 
                                        color: str
                                        ):
 
-    # get runtimes from individual runs of method 
-    data_internal: Dict[str, List[float]] = {}
+    # convert runs of method to performance evolution
+    data_internal: Dict[str, np.ndarray] = {}
     for key in method_data:
-        internal: List[float]  = []
-        for elem in method_data[key]:
-            internal.append(elem[1])
-
-        data_internal[key] = internal
-
-    # convert data to represent performance evolution
-    for key in data_internal:
-        pe: List[float] = []
-        minimum: float = data_internal[key][0]
-        for elem in data_internal[key]:
-            if elem < minimum:
-                minimum = elem
-
-            if plotting_configuration.log:
-                if plotting_configuration.unit == "gflops":
-                    pe.append(np.log10(util.get_gflops(minimum)))
-                else:
-                    pe.append(np.log10(minimum))
-            else:
-                if plotting_configuration.unit == "gflops":
-                    pe.append(util.get_gflops(minimum))
-                else:
-                    pe.append(minimum)
-
-        data_internal[key] = pe
-
-    # prepare: put data of individual runs to a list of list instead of a dictionary
-    counter: int = -1
-    means: List[float] = []
-    runs_of_method: List[List[float]] = []
-    confidence: List[float] = []
-    
-    for key in data_internal:
-        counter += 1
-        runs_of_method.append([])
-        for elem in data_internal[key]:
-            runs_of_method[counter].append(elem)
-
-    # get shortest run and cut here 
-    minElem: int = min(list(map(lambda x: len(x), runs_of_method)))
-
-    # compute mean 
-    for i in range(minElem):
-
-        # group all runs at position i 
-        runs_at_position: List[float] = [run[i] for run in runs_of_method]
-
-        # compute mean for all runs at position i
-        means.append(float(np.median(np.array(runs_at_position))))
-
-        # compute confidence interval  
-        confidence.append(sem(runs_at_position) * 1.96) 
+        data_internal[key] = performance_evolution_kernel.performance_evolution(
+            runtime=method_data[key].runtime,
+            invalid=util.get_invalid(method_data[key]),
+            log=plotting_configuration.log,
+            unit=plotting_configuration.unit,
+            )
+
+    # prepare: stack runs of method, get shortest run and cut here 
+    runs_of_method: np.ndarray = performance_evolution_kernel.stack_runs(list(data_internal.values()))
+
+    # compute mean and confidence interval for all positions at once
+    aggregate: performance_evolution_kernel.RunsAggregate = performance_evolution_kernel.aggregate(runs_of_method)
+    means: List[float] = aggregate.median.tolist()
+    confidence: List[float] = (aggregate.sem * 1.96).tolist()
 
     # create x range for plotting 
     # cut means and x if necessary 
@@ -0,0 +1,161 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+)
+
+from dataclasses import dataclass
+import warnings
+
+import numpy as np
+
+# shared computation of performance evolutions (running minimum) for all plots
+# of exploration_plotting and tuning_plotting, so it only depends on numpy
+# invalid samples never improve the minimum
+# positions before the first valid sample are NaN
+
+
+@staticmethod
+def performance_evolution(runtime: np.ndarray,
+                          invalid: np.ndarray | None = None,
+                          log: bool = False,
+                          unit: str = 'runtime',
+                          ) -> np.ndarray:
+
+    # replace invalid samples, so they are ignored by the running minimum
+    values: np.ndarray = np.asarray(runtime, dtype=np.float64)
+    if invalid is not None:
+        values = np.where(invalid, np.inf, values)
+
+    pe: np.ndarray = np.minimum.accumulate(values) if len(values) > 0 else values.copy()
+    pe[np.isinf(pe)] = np.nan
+
+    return transform(pe, log=log, unit=unit)
+
+
+@staticmethod
+def performance_evolution_chunked(chunks: Iterable[Tuple[np.ndarray, np.ndarray | None]],
+                                  log: bool = False,
+                                  unit: str = 'runtime',
+                                  ) -> Iterator[np.ndarray]:
+
+    # streaming version over (runtime, invalid) of each chunk, e.g. of util.read_file_chunks
+    # yields the performance evolution of each chunk, memory is bounded by the chunk size
+    running: RunningMinimum = RunningMinimum()
+    for (runtime, invalid) in chunks:
+        yield transform(running.update(runtime, invalid), log=log, unit=unit)
+
+    return None
+
+
+class RunningMinimum:
+    """
+    Running minimum over a stream of runtime chunks.
+    """
+
+    def __init__(self) -> None:
+        # best runtime so far and its index in the stream, -1 before the first valid sample
+        self.minimum: float = np.inf
+        self.index: int = -1
+        self.count: int = 0
+
+    def update(self, runtime: np.ndarray, invalid: np.ndarray | None = None) -> np.ndarray:
+
+        values: np.ndarray = np.asarray(runtime, dtype=np.float64)
+        if invalid is not None:
+            values = np.where(invalid, np.inf, values)
+
+        if len(values) == 0:
+            return values.copy()
+
+        # continue with the minimum of the previous chunks
+        pe: np.ndarray = np.minimum(np.minimum.accumulate(values), self.minimum)
+
+        # first occurrence of a new minimum
+        local: int = int(np.argmin(values))
+        if values[local] < self.minimum:
+            self.minimum = float(values[local])
+            self.index = self.count + local
+
+        self.count += len(values)
+
+        pe[np.isinf(pe)] = np.nan
+        return pe
+
+
+@staticmethod
+def transform(values: np.ndarray, log: bool = False, unit: str = 'runtime') -> np.ndarray:
+
+    if unit == 'gflops':
+        values = get_gflops(values)
+
+    if log:
+        values = np.log10(values)
+
+    return values
+
+
+# floating point operations of a matrix multiplication of 1024x1024 matrices
+gemm_operations: int = 2 * 1024 ** 3
+
+
+def get_gflops(runtime: float, operations: int = gemm_operations) -> float:
+    # runtime in ms
+    return 1.0e-9 * operations / runtime
+
+
+@staticmethod
+def stack_runs(runs: List[np.ndarray], pad: bool = False) -> np.ndarray:
+
+    # runs x samples, either cut to the shortest run or padded with NaN to the longest run
+    length: int = max([len(run) for run in runs]) if pad else min([len(run) for run in runs])
+
+    stacked: np.ndarray = np.full((len(runs), length), np.nan)
+    for (index, run) in enumerate(runs):
+        stacked[index, :min(length, len(run))] = run[:length]
+
+    return stacked
+
+
+@dataclass
+class RunsAggregate:
+    """
+    Statistics of stacked runs at each sample position (NaN entries are ignored).
+    """
+    median: np.ndarray
+    mean: np.ndarray
+    sem: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    count: np.ndarray
+
+
+@staticmethod
+def aggregate(stacked: np.ndarray, percentiles: Tuple[float, float] = (25.0, 75.0)) -> RunsAggregate:
+
+    # aggregate along the runs (axis 0) for all sample positions at once
+    count: np.ndarray = np.sum(~np.isnan(stacked), axis=0)
+
+    # the nan-aware reductions are considerably slower, only use them when needed
+    with warnings.catch_warnings():
+        # positions without any valid run are NaN
+        warnings.simplefilter('ignore', category=RuntimeWarning)
+        if np.all(count == stacked.shape[0]):
+            median: np.ndarray = np.median(stacked, axis=0)
+            mean: np.ndarray = np.mean(stacked, axis=0)
+            std: np.ndarray = np.std(stacked, axis=0, ddof=1)
+            (lower, upper) = np.percentile(stacked, percentiles, axis=0)
+        else:
+            median = np.nanmedian(stacked, axis=0)
+            mean = np.nanmean(stacked, axis=0)
+            std = np.nanstd(stacked, axis=0, ddof=1)
+            (lower, upper) = np.nanpercentile(stacked, percentiles, axis=0)
+
+        # standard error of the mean, same as scipy.stats.sem
+        sem: np.ndarray = std / np.sqrt(count)
+
+    return RunsAggregate(median=median, mean=mean, sem=sem, lower=lower, upper=upper, count=count)
@@ -0,0 +1,350 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    Any,
+    Dict,
+    List,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:
+    from plotting_configuration import PlottingConfiguration
+
+from dataclasses import dataclass, field
+import pickle
+
+from matplotlib import pyplot as plt
+from matplotlib.axes import Axes
+from matplotlib.colors import to_hex
+from matplotlib.ticker import FuncFormatter
+import numpy as np
+import plotly.graph_objects as go # type: ignore
+from plotly.subplots import make_subplots # type: ignore
+
+import util
+import density
+import artists
+
+# data model between the computation of a plot and its rendering
+# plots compute specs (layers of numpy arrays and axis configuration), backends draw them
+# specs are picklable, they can be cached (save, load), sent to render workers (see figure_pool)
+# and re-styled (e.g. colors, labels, limits) without recomputing the data
+
+
+@dataclass
+class Line:
+    """
+    A line through the points (x, y).
+    """
+    x: np.ndarray
+    y: np.ndarray
+    color: str
+    alpha: float = 1.0
+    width: float = 1.0
+    style: str = '-'
+    label: Union[str, None] = None
+    zorder: Union[float, None] = None
+
+
+@dataclass
+class Band:
+    """
+    A filled area between lower and upper (e.g. a confidence interval).
+    """
+    x: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    color: str
+    alpha: float = 0.2
+    label: Union[str, None] = None
+    zorder: Union[float, None] = None
+
+
+@dataclass
+class Bars:
+    """
+    Bars from bottom to bottom + height, centered at x.
+    """
+    x: np.ndarray
+    height: np.ndarray
+    bottom: np.ndarray
+    color: str
+    width: float = 0.8
+    alpha: float = 1.0
+    label: Union[str, None] = None
+    zorder: Union[float, None] = None
+
+
+@dataclass
+class Scatter:
+    """
+    Single points, density binned above the density threshold of the configuration.
+    """
+    x: np.ndarray
+    y: np.ndarray
+    color: str
+    alpha: float = 1.0
+    size: Union[float, None] = None
+    width: Union[float, None] = None
+    marker: Union[str, None] = None
+    label: Union[str, None] = None
+    zorder: Union[float, None] = None
+
+
+@dataclass
+class HLine:
+    """
+    A horizontal line over the full width of the axes (e.g. expert or default performance).
+    """
+    y: float
+    color: str
+    alpha: float = 1.0
+    style: str = '-'
+    label: Union[str, None] = None
+
+
+Layer = Union[Line, Band, Bars, Scatter, HLine]
+
+
+@dataclass
+class Axis:
+    """
+    Titles, labels, scales and limits of one axes, unset values are left to the backend.
+    """
+    title: Union[str, None] = None
+    title_fontsize: Union[float, None] = None
+    title_bold: bool = False
+    xlabel: Union[str, None] = None
+    ylabel: Union[str, None] = None
+    xscale: str = 'linear'
+    yscale: str = 'linear'
+    xlim: Union[Tuple[float, float], None] = None
+    ylim: Union[Tuple[float, float], None] = None
+    log_format: bool = False
+    legend: bool = False
+    legend_framed: bool = False
+
+
+@dataclass
+class Panel:
+    """
+    One axes of a figure, layers are drawn in order.
+    """
+    axis: Axis = field(default_factory=Axis)
+    layers: List[Layer] = field(default_factory=list)
+
+
+@dataclass
+class PlotSpec:
+    """
+    A figure with a grid of panels (row by row) and the path it is written to.
+    """
+    path: str
+    panels: List[Panel] = field(default_factory=list)
+    rows: int = 1
+    columns: int = 1
+    figsize: Union[Tuple[float, float], None] = None
+    suptitle: Union[str, None] = None
+    tight_layout: bool = False
+
+    # matplotlib or plotly, html outputs are always written by plotly
+    backend: str = 'matplotlib'
+
+
+@staticmethod
+def save(spec: PlotSpec, path: str) -> None:
+    with open(path, mode='wb') as ofd:
+        pickle.dump(spec, ofd)
+
+    return None
+
+
+@staticmethod
+def load(path: str) -> PlotSpec:
+    with open(path, mode='rb') as ifd:
+        return pickle.load(ifd)
+
+
+# no staticmethod, has to be picklable for worker processes
+def render(plotting_configuration: PlottingConfiguration, spec: PlotSpec) -> None:
+
+    # matplotlib cannot write html, plotly is used for interactive outputs
+    if spec.backend == 'plotly' or spec.path.rsplit('.', 1)[-1].lower() == 'html':
+        render_plotly(plotting_configuration, spec)
+    else:
+        render_matplotlib(plotting_configuration, spec)
+
+    return None
+
+
+@staticmethod
+def get_kwargs(**kwargs: Any) -> Dict[str, Any]:
+    # unset values are left to the defaults of the backend
+    return dict([(key, value) for (key, value) in kwargs.items() if value is not None])
+
+
+@staticmethod
+def render_matplotlib(plotting_configuration: PlottingConfiguration, spec: PlotSpec) -> None:
+
+    if len(spec.panels) > spec.rows * spec.columns:
+        raise ValueError(f"{len(spec.panels)} panels do not fit into {spec.rows}x{spec.columns} axes: {spec.path}")
+
+    fig, axles = plt.subplots(spec.rows, spec.columns, figsize=spec.figsize, squeeze=False) # type: ignore
+    if spec.suptitle is not None:
+        fig.suptitle(spec.suptitle, fontweight="bold", fontsize=12) # type: ignore
+
+    for (panel, ax) in zip(spec.panels, axles.flat):
+        draw_panel(plotting_configuration, panel, ax)
+
+    if spec.tight_layout:
+        fig.tight_layout() # type: ignore
+
+    plotting_configuration.savefig(spec.path, figure=fig)
+
+    return None
+
+
+@staticmethod
+def draw_panel(plotting_configuration: PlottingConfiguration, panel: Panel, ax: Axes) -> None:
+
+    for layer in panel.layers:
+        draw_layer(plotting_configuration, layer, panel.axis, ax)
+
+    axis: Axis = panel.axis
+    if axis.title is not None:
+        ax.set_title(axis.title, **get_kwargs(fontsize=axis.title_fontsize, fontweight="bold" if axis.title_bold else None)) # type: ignore
+
+    # x-axis
+    if axis.xlim is not None:
+        ax.set_xlim(left=axis.xlim[0], right=axis.xlim[1]) # type: ignore
+    if axis.xlabel is not None:
+        ax.set_xlabel(axis.xlabel) # type: ignore
+    if axis.xscale != 'linear':
+        ax.set_xscale(axis.xscale) # type: ignore
+
+    # y-axis
+    if axis.yscale != 'linear':
+        ax.set_yscale(axis.yscale) # type: ignore
+    if axis.ylim is not None:
+        ax.set_ylim(bottom=axis.ylim[0], top=axis.ylim[1]) # type: ignore
+    if axis.ylabel is not None:
+        ax.set_ylabel(axis.ylabel) # type: ignore
+    if axis.log_format:
+        ax.yaxis.set_major_formatter(FuncFormatter(util.log_formatter)) # type: ignore
+
+    if axis.legend:
+        legend = ax.legend() # type: ignore
+        if axis.legend_framed:
+            legend.get_frame().set_visible(True) # type: ignore
+            legend.get_frame().set_facecolor("white") # type: ignore
+            legend.get_frame().set_edgecolor("black") # type: ignore
+            legend.get_frame().set_linewidth(1.5) # type: ignore
+
+    return None
+
+
+@staticmethod
+def draw_layer(plotting_configuration: PlottingConfiguration, layer: Layer, axis: Axis, ax: Axes) -> None:
+
+    if isinstance(layer, Line):
+        ax.plot(layer.x, layer.y, **get_kwargs(color=layer.color, alpha=layer.alpha, lw=layer.width, linestyle=layer.style, label=layer.label, zorder=layer.zorder)) # type: ignore
+
+    elif isinstance(layer, Band):
+        ax.fill_between(layer.x, layer.lower, layer.upper, **get_kwargs(color=layer.color, alpha=layer.alpha, label=layer.label, zorder=layer.zorder)) # type: ignore
+
+    elif isinstance(layer, Bars):
+        artists.bars(ax, layer.x, layer.height, layer.bottom, width=layer.width,
+                     **get_kwargs(color=layer.color, alpha=layer.alpha, label=layer.label, zorder=layer.zorder))
+
+    elif isinstance(layer, Scatter):
+        # density binned for many points
+        density.scatter(ax,
+                        layer.x,
+                        layer.y,
+                        threshold=plotting_configuration.density_threshold,
+                        dpi=plotting_configuration.dpi,
+                        log_y=axis.yscale == 'log',
+                        **get_kwargs(color=layer.color, alpha=layer.alpha, s=layer.size, lw=layer.width, marker=layer.marker, label=layer.label, zorder=layer.zorder),
+                        )
+
+    elif isinstance(layer, HLine):
+        ax.axhline(y=layer.y, **get_kwargs(color=layer.color, alpha=layer.alpha, linestyle=layer.style, label=layer.label)) # type: ignore
+
+    return None
+
+
+@staticmethod
+def render_plotly(plotting_configuration: PlottingConfiguration, spec: PlotSpec) -> None:
+
+    if len(spec.panels) > spec.rows * spec.columns:
+        raise ValueError(f"{len(spec.panels)} panels do not fit into {spec.rows}x{spec.columns} axes: {spec.path}")
+
+    fig: go.Figure = make_subplots(rows=spec.rows, cols=spec.columns,
+                                   subplot_titles=[panel.axis.title or "" for panel in spec.panels])
+
+    for (index, panel) in enumerate(spec.panels):
+        (row, column) = (index // spec.columns + 1, index % spec.columns + 1)
+
+        for layer in panel.layers:
+            for trace in get_traces(plotting_configuration, layer, panel.axis):
+                fig.add_trace(trace, row=row, col=column) # type: ignore
+
+            if isinstance(layer, HLine):
+                fig.add_hline(y=layer.y, line_color=to_hex(layer.color), opacity=layer.alpha, row=row, col=column) # type: ignore
+
+        axis: Axis = panel.axis
+        fig.update_xaxes(title_text=axis.xlabel, type=axis.xscale, range=get_range(axis.xlim, axis.xscale), row=row, col=column) # type: ignore
+        fig.update_yaxes(title_text=axis.ylabel, type=axis.yscale, range=get_range(axis.ylim, axis.yscale), row=row, col=column) # type: ignore
+
+    fig.update_layout(title=spec.suptitle, showlegend=any([panel.axis.legend for panel in spec.panels])) # type: ignore
+
+    if spec.path.rsplit('.', 1)[-1].lower() == 'html':
+        fig.write_html(spec.path) # type: ignore
+    else:
+        fig.write_image(spec.path, width=density.image_size[0], height=density.image_size[1]) # type: ignore
+
+    return None
+
+
+@staticmethod
+def get_range(limits: Union[Tuple[float, float], None], scale: str) -> Union[List[float], None]:
+    # ranges of log axes are given in exponents
+    if limits is None:
+        return None
+
+    return [float(np.log10(limit)) for limit in limits] if scale == 'log' else list(limits)
+
+
+@staticmethod
+def get_traces(plotting_configuration: PlottingConfiguration, layer: Layer, axis: Axis) -> List[Any]:
+
+    if isinstance(layer, Line):
+        return [go.Scatter(x=layer.x, y=layer.y, mode='lines', name=layer.label, showlegend=layer.label is not None, opacity=layer.alpha,
+                           line=dict(color=to_hex(layer.color), width=layer.width, dash='dash' if layer.style == '--' else 'solid'))]
+
+    if isinstance(layer, Band):
+        # the band is filled from the upper to the lower bound
+        return [
+            go.Scatter(x=layer.x, y=layer.upper, mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'),
+            go.Scatter(x=layer.x, y=layer.lower, mode='lines', line=dict(width=0), fill='tonexty', fillcolor=to_hex(layer.color),
+                       opacity=layer.alpha, name=layer.label, showlegend=layer.label is not None),
+            ]
+
+    if isinstance(layer, Bars):
+        return [go.Bar(x=layer.x, y=layer.height, base=layer.bottom, width=layer.width, marker_color=to_hex(layer.color), opacity=layer.alpha,
+                       name=layer.label, showlegend=layer.label is not None)]
+
+    if isinstance(layer, Scatter):
+
+        # density binned at the size of the image for many points
+        if len(layer.x) > plotting_configuration.density_threshold:
+            return [density.heatmap(layer.x, layer.y, colorscale=[[0, 'rgba(255, 255, 255, 0)'], [1, to_hex(layer.color)]],
+                                    log_y=axis.yscale == 'log', name=layer.label)]
+
+        return [go.Scatter(x=layer.x, y=layer.y, mode='markers', name=layer.label, showlegend=layer.label is not None, opacity=layer.alpha,
+                           marker=dict(color=to_hex(layer.color), size=layer.size if layer.size is not None else 6))]
+
+    return []
@@ -3,10 +3,17 @@ from typing import (
     Union,
     Callable,
     Tuple,
-    Dict
+    Dict,
+    List,
+    Any,
 )
 
 import argparse
+import copy
+import os
+
+from matplotlib import pyplot as plt
+from matplotlib.figure import Figure
 
 # import plotting methods as static methods
 from scatter import scatter
@@ -22,6 +29,9 @@ from violin import violin
 from facet import facet_plot 
 from tuning_ranges_playground import tuning_ranges_playground
 from tuning_budget_analysis import tuning_budget_analysis
+from watch import watch
+from convert import convert
+import rendering
 
 
 class PlottingConfiguration:
@@ -33,7 +43,8 @@ class PlottingConfiguration:
 
         # define parser 
         plotting_parser = argparse.ArgumentParser(description='Plotting Parser')
-        plotting_parser.add_argument('-p', '--plot', choices=plotting_methods.keys(), help='Plotting Method', required=True)
+        plotting_parser.add_argument('-p', '--plot', choices=plotting_methods.keys(), action='append', help='Plotting Method (repeat to create multiple plots)')
+        plotting_parser.add_argument('-b', '--batch', help='Batch Plan (toml) with multiple plots')
         plotting_parser.add_argument('-i', '--input', help='Input Folder', required=True)
         plotting_parser.add_argument('-o', '--output', help='Output File')
         plotting_parser.add_argument('-e', '--expert', type=float, help='Expert Performance')
@@ -41,20 +52,51 @@ class PlottingConfiguration:
         plotting_parser.add_argument('-l', '--log', action='store_true', help='Plot Log')
         plotting_parser.add_argument('-n', '--name', help='Give Name')
         plotting_parser.add_argument('-li', '--limit', type=int, help='Limit Plotting')
-        plotting_parser.add_argument('-f', '--format', type=str, help='File format')
+        plotting_parser.add_argument('-f', '--format', type=str, help='File format (parquet or arrow for convert)')
         plotting_parser.add_argument('-pi', '--plot_invalid', action='store_true', help='Plot Invalid Rewrites')
         plotting_parser.add_argument('-u', '--unit',
                                      choices=['runtime', 'gflops'],
                                      help='Unit ')
+        plotting_parser.add_argument('-j', '--jobs', type=int, default=1, help='Parallel Jobs for Loading and Rendering')
+        plotting_parser.add_argument('-r', '--rasterize', type=int, default=10000, help='Rasterize Artists with more Primitives in Vector Formats (0 to disable)')
+        plotting_parser.add_argument('-w', '--watch', type=float, nargs='?', const=10.0, help='Watch Running Exploration (Refresh Interval in Seconds)')
 
 
         # parse args and initialize variables     
         args: argparse.Namespace = plotting_parser.parse_args()
 
+        # plots to create, given by -p and/or by a batch plan
+        entries: List[Dict[str, Any]] = [{'plot': plot} for plot in args.plot or []]
+        if args.batch:
+            entries += load_plan(args.batch)
+
+        if len(entries) == 0:
+            plotting_parser.error("one of the arguments -p/--plot -b/--batch is required")
+
+        # options shared by all plots
+        self.options: Dict[str, Any] = vars(args)
+
+        # one configuration for each plot, all plots share the loaded data
+        self.batch: List[PlottingConfiguration] = []
+        for entry in entries:
+            try:
+                configuration: PlottingConfiguration = copy.copy(self)
+                configuration.configure(self.resolve(entry))
+                configuration.batch = [configuration]
+            except (KeyError, ValueError) as e:
+                plotting_parser.error(f"invalid plot {entry}: {e}")
+
+            self.batch.append(configuration)
+
+        # the configuration itself describes the first plot
+        self.configure(self.resolve(entries[0]))
+
+    def configure(self, options: Dict[str, Any]) -> None:
+
         # method, input, output 
-        self.plotting_method: Callable[[PlottingConfiguration], None] = plotting_methods[args.plot]
-        self.input: str = args.input
-        output: str = args.output
+        self.plotting_method: Callable[[PlottingConfiguration], None] = plotting_methods[options['plot']]
+        self.input: str = options['input']
+        output: str = options['output']
         self.output: str = ""
         if not output:
             self.output = self.input
@@ -62,46 +104,109 @@ class PlottingConfiguration:
             self.output = output
 
         # parse name
-        name: str = args.name
+        name: str = options['name']
         self.name: str = ""
         if name:
-            self.name = args.name
+            self.name = options['name']
         else:
             self.name = str(self.output).split('/')[-1]
 
 
         # parse optional arguments
-        self.expert: Union[float, None] = args.expert
-        self.default: Union[float, None] = args.default
-        self.limit: Union[int, None] = args.limit
-        self.format: Union[str, None] = args.format
-        self.plot_invalid: bool = args.plot_invalid 
-
-        if args.format is not None:
-            self.format = args.format
+        self.expert: Union[float, None] = options['expert']
+        self.default: Union[float, None] = options['default']
+        self.limit: Union[int, None] = options['limit']
+        self.format: Union[str, None] = options['format']
+        self.plot_invalid: bool = options['plot_invalid']
+
+        if options['format'] is not None:
+            self.format = options['format']
         else:
             self.format = 'pdf'
 
         self.plot_invalid = False
-        if args.plot_invalid:
+        if options['plot_invalid']:
             self.plot_invalid = True
 
         self.log = False
-        if args.log:
+        if options['log']:
             self.log = True
 
-        if args.unit:
-            self.unit: str = args.unit
+        if options['unit']:
+            if options['unit'] not in ['runtime', 'gflops']:
+                raise ValueError(f"unknown unit: {options['unit']}")
+            self.unit: str = options['unit']
         else:
             self.unit: str = "runtime"
 
+        self.jobs: int = max(1, options['jobs'])
+
+        # dense artists are rasterized in vector outputs, can be set per plot in a batch plan
+        self.rasterize: int = options['rasterize']
+
+        # live view, only for the performance evolution
+        self.watch: Union[float, None] = options['watch']
+        if self.watch is not None and options['plot'] not in watch_methods:
+            raise ValueError(f"--watch is only supported for: {', '.join(watch_methods)}")
+
         # constant arguments
         self.figsize: Tuple[int, int] = (8, 8)
         self.dpi = 1000
         self.fontsize = 11
 
+        # scatter plots with more points are density binned (see density)
+        self.density_threshold: int = 100000
+
+    def resolve(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+
+        # check for unknown options
+        for key in entry:
+            if key not in self.options or key == 'batch':
+                raise KeyError(key)
+
+        options: Dict[str, Any] = dict(self.options, **entry)
+
+        # inputs of entries are relative to the shared input
+        if 'input' in entry:
+            options['input'] = os.path.join(self.options['input'], entry['input'])
+
+        return options
+
+    def savefig(self, path: str, figure: Union[Figure, None] = None) -> None:
+
+        # current figure by default, as for plt.savefig
+        if figure is None:
+            figure = plt.gcf()
+
+        if self.rasterize > 0 and rendering.is_vector_format(path):
+            rendering.rasterize(figure, self.rasterize)
+
+        # rasterized artists are drawn at the dpi of the output
+        figure.savefig(path, dpi=self.dpi) # type: ignore
+
+        return None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # plotting methods are static methods and cannot be pickled, they are kept by name
+        # e.g. for worker processes (see figure_pool)
+        state: Dict[str, Any] = dict(vars(self))
+        if 'plotting_method' in state:
+            state['plotting_method'] = next(name for (name, method) in plotting_methods.items() if method is self.plotting_method)
+
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        if 'plotting_method' in state:
+            state['plotting_method'] = plotting_methods[state['plotting_method']]
+
+        self.__dict__.update(state)
+
     def plot(self) -> None:
-        self.plotting_method(self)
+        for configuration in self.batch:
+            if configuration.watch is not None:
+                watch(configuration)
+            else:
+                configuration.plotting_method(configuration)
         pass
 
     def __str__(self) -> str:
@@ -117,8 +222,29 @@ class PlottingConfiguration:
         file_format: {self.format}
         plot_invalid: {self.plot_invalid}
         unit: {self.unit}
+        jobs: {self.jobs}
+        rasterize: {self.rasterize}
+        watch: {self.watch}
         """
 
+
+def load_plan(plan: str) -> List[Dict[str, Any]]:
+
+    # tomllib is part of the standard library since python 3.11, tomli before
+    try:
+        import tomllib
+    except ModuleNotFoundError:
+        import tomli as tomllib # type: ignore
+
+    with open(plan, mode='rb') as ifd:
+        content: Dict[str, Any] = tomllib.load(ifd)
+
+    # top level values are shared by all plots of the plan
+    shared: Dict[str, Any] = dict([(key, value) for (key, value) in content.items() if key != 'plots'])
+
+    return [dict(shared, **entry) for entry in content.get('plots', [])]
+
+
 # register plotting methods 
 plotting_methods: Dict[str, Callable[[PlottingConfiguration], None]]= {
     "scatter": scatter,
@@ -134,4 +260,10 @@ plotting_methods: Dict[str, Callable[[PlottingConfiguration], None]]= {
     "violin": violin,
     "tuning_ranges_playground" : tuning_ranges_playground,
     "tuning_budget_analysis": tuning_budget_analysis,
-}
\ No newline at end of file
+    "convert": convert,
+}
+
+# plotting methods with a live view (--watch)
+watch_methods: List[str] = [
+    "performance_evolution",
+]
@@ -0,0 +1,76 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    List,
+)
+
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
+from matplotlib.collections import Collection
+from matplotlib.figure import Figure
+from matplotlib.image import AxesImage
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+import numpy as np
+
+# rasterization policy for vector outputs (pdf, svg, eps)
+# artists with many primitives (points, segments, polygons) are embedded as images at the dpi of the output
+# axes, ticks, labels, legends and all text stay vector
+
+# formats with mixed mode rendering, raster formats are not affected
+vector_formats: List[str] = ["pdf", "svg", "eps", "ps"]
+
+
+@staticmethod
+def count_primitives(artist: Artist) -> int:
+
+    # points of a scatter, segments of vlines/hlines, polygons of bars and bands
+    if isinstance(artist, Collection):
+        offsets: np.ndarray = np.asarray(artist.get_offsets())
+        return max(len(artist.get_paths()), len(offsets) if offsets.ndim == 2 else 0)
+
+    # vertices of a line, or its markers
+    if isinstance(artist, Line2D):
+        return len(artist.get_xydata()) # type: ignore
+
+    # single patches (e.g. bars of plt.bar) count as one primitive
+    if isinstance(artist, Patch):
+        return 1
+
+    return 0
+
+
+@staticmethod
+def get_data_artists(ax: Axes) -> List[Artist]:
+    # artists that show data, images are raster anyway
+    return [artist for artist in ax.get_children()
+            if isinstance(artist, (Collection, Line2D, Patch)) and not isinstance(artist, AxesImage)
+            and artist is not ax.patch and artist not in ax.spines.values()]
+
+
+@staticmethod
+def rasterize(figure: Figure, threshold: int) -> int:
+
+    # rasterize the data artists of all axes above the threshold, returns the number of rasterized artists
+    # single artists above the threshold are rasterized, and all collections and patches of an axes
+    # if they exceed the threshold together (e.g. thousands of plt.vlines, plt.scatter or plt.bar calls)
+    rasterized: int = 0
+    for ax in figure.get_axes():
+        artists: List[Artist] = get_data_artists(ax)
+        counts: List[int] = [count_primitives(artist) for artist in artists]
+
+        shapes: int = sum([count for (artist, count) in zip(artists, counts) if not isinstance(artist, Line2D)])
+
+        for (artist, count) in zip(artists, counts):
+            if count > threshold or (not isinstance(artist, Line2D) and shapes > threshold):
+                if not artist.get_rasterized():
+                    artist.set_rasterized(True)
+                    rasterized += 1
+
+    return rasterized
+
+
+@staticmethod
+def is_vector_format(path: str) -> bool:
+    return path.rsplit('.', 1)[-1].lower() in vector_formats
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import util
+import density
 
 import plotly.graph_objects as go # type: ignore
 
@@ -15,9 +16,10 @@ from typing import (
 if TYPE_CHECKING:
     from plotting_configuration import PlottingConfiguration
 
+
 @staticmethod
 def scatter(plotting_configuration: PlottingConfiguration) -> None:
-    data: util.ExplorationData = util.get_data_fully(plotting_configuration.input)
+    data: util.ExplorationData = util.get_data_fully(plotting_configuration.input, plotting_configuration.jobs, util.runtime_columns)
 
     for method in data:
 
@@ -25,22 +27,23 @@ def scatter(plotting_configuration: PlottingConfiguration) -> None:
                            xaxis=dict(title='Samples'),
                            yaxis=dict(title='Log Runtime (ms)'))
 
-        y: List[float] = []
+        runs: List[np.ndarray] = []
         print(f"method: {method}")
         for run in data[method][1]:
 
-            maximum: float = max([float(elem['runtime']) for elem in data[method][1][run]])
-
-            for line in data[method][1][run]:
+            # invalid samples are placed above the maximum
+            runtime: np.ndarray = data[method][1][run].runtime
+            maximum: float = float(runtime.max())
+            runs.append(np.log10(np.where(runtime < 0, maximum * 1.01, runtime)))
 
-                if float(line['runtime']) < 0:
-                    y.append(np.log10(maximum * 1.01))
-                else:
-                    y.append(np.log10(float(line['runtime'])))
+        y: np.ndarray = np.concatenate(runs) if len(runs) > 0 else np.zeros(0)
+        x: np.ndarray = np.arange(len(y))
 
-        x: List[int] = list(range(len(y)))
+        trace: go.Scatter | go.Heatmap = go.Scatter(x=x, y=y, mode='markers', marker=dict(size=0.5, color='black'))
 
-        trace: go.Scatter = go.Scatter(x=x, y=y, mode='markers', marker=dict(size=0.5, color='black'))
+        # density binned at the size of the image for many samples
+        if len(y) > plotting_configuration.density_threshold:
+            trace = density.heatmap(x, y, colorscale=[[0, 'rgb(160, 160, 160)'], [1, 'black']])
 
         fig: go.Figure = go.Figure(data=trace, layout=layout)
 
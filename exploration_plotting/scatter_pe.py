@@ -10,93 +10,68 @@ if TYPE_CHECKING:
     from plotting_configuration import PlottingConfiguration
 
 import util
-
-from matplotlib import pyplot as plt
+import performance_evolution_kernel
+import figure_pool
+import plot_spec
 
 import numpy as np
 
 
 @staticmethod
 def scatter_pe(plotting_configuration: PlottingConfiguration) -> None:
-    exploration_data: util.ExplorationData = util.get_data_fully(plotting_configuration.input)
+    exploration_data: util.ExplorationData = util.get_data_fully(plotting_configuration.input, plotting_configuration.jobs, util.runtime_columns)
+
+    # specs of all figures, one figure per method
+    specs: List[plot_spec.PlotSpec] = []
 
     counter: int = 0
     for method in exploration_data:
 
-        # clear 
-        plt.clf()
-
-        # seaborn
-        # plt.style.use('seaborn-v0_8-darkgrid')
-
-        # assemble plot
-        plt.title(plotting_configuration.name + " - Scatter", fontsize=plotting_configuration.fontsize) # type: ignore
-        plt.xlabel("Samples") # type: ignore
-        plt.ylabel("Log Runtime (ms)") # type: ignore
-
-
+        layers: List[plot_spec.Layer] = []
         for run in exploration_data[method][1]:
 
-            y: List[float] = []
+            runtime: np.ndarray = exploration_data[method][1][run].runtime
+            color: str = util.colors[counter % len(util.colors)]
 
-            maximum: float = max([float(elem['runtime']) for elem in exploration_data[method][1][run]])
+            # invalid samples are placed above the maximum
+            maximum: float = float(runtime.max())
+            y: np.ndarray = np.log10(np.where(runtime < 0, maximum * 1.01, runtime))
+            x: np.ndarray = np.arange(len(y))
 
-            for line in exploration_data[method][1][run]:
+            # add line for performance evolution
+            # new entry everytime we find a new minimum value 
+            pe: np.ndarray = performance_evolution_kernel.performance_evolution(
+                runtime=runtime,
+                invalid=runtime <= 0,
+                log=True,
+                )
 
-                if float(line['runtime']) < 0:
-                    y.append(np.log10(maximum * 1.01))
-                else:
-                    y.append(np.log10(float(line['runtime'])))
+            layers.append(plot_spec.Line(x, pe, color=color, alpha=0.9, width=0.5, label=run))
 
-            x: List[float] = list(range(len(y)))
+            # density binned for runs with many samples
+            layers.append(plot_spec.Scatter(x, y, color=color, alpha=0.9, size=0.2, width=0.2, label=run))
 
-            # add line for performance evolution
-            pe: List[float] = []
-
-            # init minimum with first valid value found 
-            minimum: float = 0
-            for line in exploration_data[method][1][run]:
-                if(float(line['runtime']) > 0):
-                    minimum = float(line['runtime'])
-                    break
-                    
-            # create performance evolution 
-            # new entry everytime we find a new minimum value 
-            for line in exploration_data[method][1][run]:
-                if float(line['runtime']) > 0:
-                    if float(line['runtime']) < minimum:
-                        minimum = float(line['runtime'])
-                pe.append(np.log10(minimum))
-
-            # plot
-            plt.plot(x, # type: ignore
-                     pe, 
-                     alpha=0.9, 
-                     color=util.colors[counter % len(util.colors)], 
-                     lw=0.5, 
-                     label=run
-                     ) 
-            plt.scatter(x, # type: ignore
-                        y, 
-                        alpha=0.9, 
-                        color=util.colors[counter % len(util.colors)], 
-                        label=run, 
-                        lw=0.2, 
-                        s=0.2
-                        )
             counter += 1
 
-    # add legend
-    # plt.legend()
-    # change size of points?
-
         # save to file
         log_appendix:str = ""
         if plotting_configuration.log:
             log_appendix = "_log"
 
-        plt.savefig( # type: ignore
-            f"{plotting_configuration.output}/{plotting_configuration.name}_scatter_pe_{method}{log_appendix}.{plotting_configuration.format}",
-            dpi=plotting_configuration.dpi)
-
-    return None
\ No newline at end of file
+        specs.append(plot_spec.PlotSpec(
+            path=f"{plotting_configuration.output}/{plotting_configuration.name}_scatter_pe_{method}{log_appendix}.{plotting_configuration.format}",
+            panels=[plot_spec.Panel(
+                axis=plot_spec.Axis(
+                    title=plotting_configuration.name + " - Scatter",
+                    title_fontsize=plotting_configuration.fontsize,
+                    xlabel="Samples",
+                    ylabel="Log Runtime (ms)",
+                    ),
+                layers=layers,
+                )],
+            ))
+
+    # figures are independent, rendered in parallel with multiple jobs
+    figure_pool.render(plotting_configuration, plot_spec.render, [(spec,) for spec in specs])
+
+    return None
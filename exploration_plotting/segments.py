@@ -0,0 +1,116 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    List,
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:
+    from exploration_table import ExplorationTable
+
+import numpy as np
+
+# segmented reductions over the runtimes of one run
+# each segment is a tuning run, given by its start offset (see ExplorationTable.group_starts)
+# invalid samples (runtime -1) are ignored, groups without valid samples yield NaN
+
+
+class Segments:
+    """
+    Per tuning run reductions over a runtime array and the group offsets of a run.
+    """
+
+    def __init__(self,
+                 runtime: np.ndarray,
+                 starts: np.ndarray,
+                 invalid: np.ndarray | None = None,
+                 ) -> None:
+
+        self.runtime: np.ndarray = np.asarray(runtime, dtype=np.float64)
+        self.starts: np.ndarray = np.asarray(starts, dtype=np.intp)
+        self.ends: np.ndarray = np.append(self.starts[1:], len(self.runtime)).astype(np.intp)
+        self.lengths: np.ndarray = self.ends - self.starts
+
+        # invalid samples are marked with a runtime of -1
+        self.invalid: np.ndarray = self.runtime == -1 if invalid is None else np.asarray(invalid, dtype=bool)
+
+        # runtime with NaN for invalid samples, ignored by fmin/fmax
+        self.masked: np.ndarray = np.where(self.invalid, np.nan, self.runtime)
+
+        # prefix minimum matrix, built on first use and widened for larger budgets
+        self.running: np.ndarray | None = None
+
+    @staticmethod
+    def from_run(run: ExplorationTable) -> Segments:
+        # segments are kept with the run, so the prefix minima are shared by all plots
+        return run.segments
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def reduce(self, ufunc: np.ufunc, values: np.ndarray) -> np.ndarray:
+        if len(self.starts) == 0:
+            return np.zeros(0, dtype=values.dtype)
+
+        return ufunc.reduceat(values, self.starts)
+
+    def valid_count(self) -> np.ndarray:
+        return self.reduce(np.add, (~self.invalid).astype(np.int64))
+
+    def minimum(self) -> np.ndarray:
+        return self.reduce(np.fmin, self.masked)
+
+    def maximum(self) -> np.ndarray:
+        return self.reduce(np.fmax, self.masked)
+
+    def first_valid_index(self) -> np.ndarray:
+        # absolute index of the first valid sample in each group, -1 if there is none
+        positions: np.ndarray = np.where(self.invalid, len(self.runtime), np.arange(len(self.runtime)))
+        first: np.ndarray = self.reduce(np.minimum, positions)
+
+        return np.where(first < self.ends, first, -1)
+
+    def first_valid(self) -> np.ndarray:
+        first: np.ndarray = self.first_valid_index()
+        return np.where(first >= 0, self.runtime[np.maximum(first, 0)], np.nan)
+
+    def argmin(self) -> np.ndarray:
+        # offset of the (first) minimum within each group, -1 if there is no valid sample
+        minimum: np.ndarray = self.minimum()
+        is_minimum: np.ndarray = self.masked == np.repeat(minimum, self.lengths)
+        positions: np.ndarray = np.where(is_minimum, np.arange(len(self.runtime)), len(self.runtime))
+        first: np.ndarray = self.reduce(np.minimum, positions)
+
+        return np.where(first < self.ends, first - self.starts, -1)
+
+    def prefix_minimum(self, limits: List[int]) -> np.ndarray:
+        # groups x limits, minimum of the first limit samples of each group
+        # limits beyond the end of a group use the whole group
+        limits_array: np.ndarray = np.asarray(limits, dtype=np.intp)
+        if len(self.starts) == 0 or len(limits_array) == 0:
+            return np.full((len(self.starts), len(limits_array)), np.nan)
+
+        # each limit is a column lookup in the prefix minimum matrix
+        running: np.ndarray = self.running_minimum(int(limits_array.max()))
+        columns: np.ndarray = np.minimum(limits_array, running.shape[1]) - 1
+
+        return running[:, np.maximum(columns, 0)]
+
+    def running_minimum(self, budget: int) -> np.ndarray:
+        # groups x budget, running minimum over the first budget samples of each group
+        # NaN until the first valid sample of a group
+        # positions past the end of a group repeat the minimum of the whole group
+        # the matrix is at most as wide as the longest group
+        width: int = max(1, min(budget, int(self.lengths.max()) if len(self.lengths) > 0 else 1))
+
+        if self.running is None or self.running.shape[1] < width:
+            offsets: np.ndarray = np.arange(width)
+            positions: np.ndarray = self.starts[:, None] + np.minimum(offsets[None, :], np.maximum(self.lengths[:, None] - 1, 0))
+
+            values: np.ndarray = np.where(self.invalid[positions], np.inf, self.runtime[positions])
+            running: np.ndarray = np.minimum.accumulate(values, axis=1)
+            running[np.isinf(running)] = np.nan
+            self.running = running
+
+        return self.running[:, :width]
@@ -21,7 +21,7 @@ import util
 
 
 def speedup(plotting_configuration: PlottingConfiguration) -> None:
-    data = util.get_data_fully(plotting_configuration.input)
+    data = util.get_data_fully(plotting_configuration.input, plotting_configuration.jobs, util.runtime_columns)
 
     speedup_total_std(data, plotting_configuration)
     # speedup_total_grouped_by_category(data, plotting_configuration)
@@ -87,9 +87,8 @@ def speedup_total_std(data, plotting_configuration: PlottingConfiguration) -> No
     if plotting_configuration.log:
         log_appendix = "_log"
 
-    plt.savefig(
-        f"{plotting_configuration.output}/{plotting_configuration.name}{log_appendix}_speedup.{plotting_configuration.format}",
-        dpi=plotting_configuration.dpi)
+    plotting_configuration.savefig(
+        f"{plotting_configuration.output}/{plotting_configuration.name}{log_appendix}_speedup.{plotting_configuration.format}")
 
     pass
 
@@ -183,9 +182,8 @@ def speedup_total_grouped_by_category(data, plotting_configuration: PlottingConf
     if plotting_configuration.log:
         log_appendix = "_log"
 
-    plt.savefig(
-        f"{plotting_configuration.output}/{plotting_configuration.name}{log_appendix}_speedup_grouped.{plotting_configuration.format}",
-        dpi=plotting_configuration.dpi)
+    plotting_configuration.savefig(
+        f"{plotting_configuration.output}/{plotting_configuration.name}{log_appendix}_speedup_grouped.{plotting_configuration.format}")
 
 
 def speedup_total_grouped_by_method(data, plotting_configuration: PlottingConfiguration) -> None:
@@ -273,6 +271,5 @@ def speedup_total_grouped_by_method(data, plotting_configuration: PlottingConfig
     if plotting_configuration.log:
         log_appendix = "_log"
 
-    plt.savefig(
-        f"{plotting_configuration.output}/{plotting_configuration.name}{log_appendix}_speedup_grouped_method.{plotting_configuration.format}",
-        dpi=plotting_configuration.dpi)
+    plotting_configuration.savefig(
+        f"{plotting_configuration.output}/{plotting_configuration.name}{log_appendix}_speedup_grouped_method.{plotting_configuration.format}")
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
     from plotting_configuration import PlottingConfiguration
 
 import util
+import segments
 
 from matplotlib import pyplot as plt
 from matplotlib.ticker import LogFormatter
@@ -47,7 +48,7 @@ bar_colors: Dict[str, str] = {
 def speedup_stacking_rewriting_and_tuning(plotting_configuration: PlottingConfiguration) -> None:
 
     # get data an group by tuning runs 
-    multiple_exploration_data: util.MultipleExplorationData = util.get_multiple_data_fully(plotting_configuration.input)
+    multiple_exploration_data: util.MultipleExplorationData = util.get_multiple_data_fully(plotting_configuration.input, plotting_configuration.jobs, ['runtime', 'rewrite'])
 
     plt.clf()
     plt.figure( # type: ignore
@@ -78,47 +79,31 @@ def speedup_stacking_rewriting_and_tuning(plotting_configuration: PlottingConfig
 
             benchmarks.append(f"{benchmark}")
 
-            grouped_by_tuning: List[List[Dict[str, str]]] = util.group_by_tuning(multiple_exploration_data[benchmark][method][1][run])
+            # per tuning run reductions over the runtimes of the run
+            tuning_runs: segments.Segments = segments.Segments.from_run(multiple_exploration_data[benchmark][method][1][run])
 
             # get tuning only speedup 
-            baseline_group: List[Dict[str, str]] = grouped_by_tuning[0]
-            baseline_tuning_run: List[float] = [float(sample['runtime']) for sample in baseline_group]
-            baseline: float = get_first_valid_elem(baseline_tuning_run)
-            minimum: float = min(list(filter(lambda sample: sample != -1, baseline_tuning_run)))
+            baseline: float = float(tuning_runs.first_valid()[0])
+            minimum: float = float(tuning_runs.minimum()[0])
             speedup_tuning_only.append(baseline / minimum)
 
-            bounds_min_max: List[Dict[str, float]] = []
-            bounds_first_valid_min: List[Dict[str, float]] = []
-
-            # get runtime only
-            # and filter all tuning runs that are completely invalid 
-            tuning_runs: List[List[float]] = []
-            for group in grouped_by_tuning:
-                tuning_run: List[float] = []
-                for sample in group:
-                    tuning_run.append(float(sample['runtime']))
-                tuning_runs.append(tuning_run)
-
-            tuning_runs = list(filter(lambda run: len(list(filter(lambda sample: sample != -1, run))), tuning_runs))
+            # filter all tuning runs that are completely invalid 
+            valid: np.ndarray = tuning_runs.valid_count() > 0
+            first_valid: np.ndarray = tuning_runs.first_valid()[valid]
+            minima: np.ndarray = tuning_runs.minimum()[valid]
+            maxima: np.ndarray = tuning_runs.maximum()[valid]
 
             # get baseline
-            baseline: float = get_first_valid_elem(tuning_runs[0])
+            baseline: float = float(first_valid[0])
 
             # plot only best X tuning runs 
             # tuning_runs = get_best_tuning_runs(tuning_runs, 10)
 
-            # get min max for each tuning run 
-            for tuning_run in tuning_runs:
-                bounds_min_max.append(get_min_max(tuning_run))
-
-            for tuning_run in tuning_runs:
-                bounds_first_valid_min.append(get_first_valid_max(tuning_run))
-
-
             # mean speedup for this method 
-            mean_speedup_rewriting_worst: float = float(np.mean([baseline / bound['rewriting'] for bound in bounds_min_max]))
-            mean_speedup_rewriting: float = float(np.mean([baseline / bound['rewriting'] for bound in bounds_first_valid_min]))
-            mean_speedup_tuning: float = float(np.mean([baseline / bound['tuning'] for bound in bounds_first_valid_min]))
+            # rewriting (lowest): maximum of each tuning run, rewriting (heuristic): first valid, tuning: minimum
+            mean_speedup_rewriting_worst: float = float(np.mean(baseline / maxima))
+            mean_speedup_rewriting: float = float(np.mean(baseline / first_valid))
+            mean_speedup_tuning: float = float(np.mean(baseline / minima))
 
             # append to speedups 
             speedups_rewriting_worst.append(mean_speedup_rewriting_worst)
@@ -197,9 +182,8 @@ def speedup_stacking_rewriting_and_tuning(plotting_configuration: PlottingConfig
     log_appendix: str = ""
     if plotting_configuration.log:
         log_appendix = "_log"
-    plt.savefig( # type: ignore
-        f"{plotting_configuration.output}/{plotting_configuration.name}_relative{log_appendix}.{plotting_configuration.format}",
-        dpi=plotting_configuration.dpi)
+    plotting_configuration.savefig(
+        f"{plotting_configuration.output}/{plotting_configuration.name}_relative{log_appendix}.{plotting_configuration.format}")
 
     return None
 
@@ -209,7 +193,7 @@ def speedup_stacking_tuning_only(plotting_configuration: PlottingConfiguration)
 
 
     # get data an group by tuning runs 
-    multiple_exploration_data: util.MultipleExplorationData = util.get_multiple_data_fully(plotting_configuration.input)
+    multiple_exploration_data: util.MultipleExplorationData = util.get_multiple_data_fully(plotting_configuration.input, plotting_configuration.jobs, ['runtime', 'rewrite'])
 
     plt.clf()
     plt.figure( # type: ignore
@@ -233,20 +217,11 @@ def speedup_stacking_tuning_only(plotting_configuration: PlottingConfiguration)
 
                 benchmarks.append(f"{benchmark}")
 
-                grouped_by_tuning: List[List[Dict[str, str]]] = util.group_by_tuning(multiple_exploration_data[benchmark][method][1][run])
-
-                # get first tuning run 
-                baseline_group: List[Dict[str, str]] = grouped_by_tuning[0]
-                baseline_tuning_run: List[float] = [float(sample['runtime']) for sample in baseline_group]
+                tuning_runs: segments.Segments = segments.Segments.from_run(multiple_exploration_data[benchmark][method][1][run])
 
-                # get min that is not -1 
-
-                # bounds_min_max: List[Dict[str, float]] = []
-                # bounds_first_valid_min: List[Dict[str, float]] = []
-
-                # get baseline
-                baseline: float = get_first_valid_elem(baseline_tuning_run)
-                minimum: float = min(list(filter(lambda sample: sample != -1, baseline_tuning_run)))
+                # get baseline and min that is not -1 of the first tuning run
+                baseline: float = float(tuning_runs.first_valid()[0])
+                minimum: float = float(tuning_runs.minimum()[0])
                 speedups.append(baseline / minimum)
 
     # plot speedups
@@ -263,9 +238,8 @@ def speedup_stacking_tuning_only(plotting_configuration: PlottingConfiguration)
     log_appendix: str = ""
     if plotting_configuration.log:
         log_appendix = "_log"
-    plt.savefig( # type: ignore
-        f"{plotting_configuration.output}/{plotting_configuration.name}_tuning_only{log_appendix}.{plotting_configuration.format}",
-        dpi=plotting_configuration.dpi)
+    plotting_configuration.savefig(
+        f"{plotting_configuration.output}/{plotting_configuration.name}_tuning_only{log_appendix}.{plotting_configuration.format}")
 
     return None
 
@@ -274,32 +248,3 @@ def speedup_stacking_tuning_only(plotting_configuration: PlottingConfiguration)
 def get_best_tuning_runs(tuning_runs: List[List[float]], amount: int) -> List[List[float]]:
     # sort tuning runs by runtime and only return x best 
     return sorted(tuning_runs, key=lambda run: min(list(filter(lambda sample: sample != -1, run))))[:amount]
-
-
-@staticmethod
-def get_first_valid_max(tuning_run: List[float]) -> Dict[str, float]:
-
-    first_valid: float = get_first_valid_elem(tuning_run)
-    minimum: float = min(list(filter(lambda sample: sample != -1, tuning_run)))
-
-    return {'rewriting': first_valid, 'tuning': minimum}
-
-
-@staticmethod
-def get_min_max(tuning_run: List[float]) -> Dict[str, float]:
-
-    minimum: float = min(list(filter(lambda sample: sample != -1, tuning_run)))
-    maximum: float = max(list(filter(lambda sample: sample != -1, tuning_run)))
-
-    return {'rewriting': maximum, 'tuning': minimum}
-
-
-@staticmethod
-def get_first_valid_elem(tuning_run: List[float]) -> float:
-
-    for sample in tuning_run:
-        if(sample != -1):
-            return sample
-    return -1
-
-
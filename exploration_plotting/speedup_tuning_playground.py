@@ -7,8 +7,10 @@ if TYPE_CHECKING:
     from plotting_configuration import PlottingConfiguration
 
 import util
+import artists
 
 from matplotlib import pyplot as plt
+import numpy as np
 
 # from scipy.stats import sem
 
@@ -16,7 +18,7 @@ from matplotlib import pyplot as plt
 # plt.style.use('seaborn-v0_8-darkgrid')
 
 def speedup_tuning(plotting_configuration: PlottingConfiguration) -> None:
-    data = util.get_data_fully(plotting_configuration.input)
+    data = util.get_data_fully(plotting_configuration.input, plotting_configuration.jobs, ['runtime', 'rewrite', 'error-level'])
 
     # speedup_tuning_overlapped(data, plotting_configuration)
     # max_speedup(data, plotting_configuration)
@@ -95,10 +97,13 @@ def performance_of_tuning(data, plotting_configuration: PlottingConfiguration) -
             width = 0.99
             # Create a bar plot
 
-            counter = 0
-            for speedup in tuning_ranges:
-                plt.vlines(x=counter, ymin=speedup['baseline'], ymax=speedup['minimum'], linewidth=0.8)
-                counter += 1
+            # one collection for the ranges of all tuning runs
+            artists.ranges(plt.gca(),
+                           x=ind,
+                           ymin=[speedup['baseline'] for speedup in tuning_ranges],
+                           ymax=[speedup['minimum'] for speedup in tuning_ranges],
+                           linewidth=0.8,
+                           )
 
             # plt.bar(ind, tuning_speedups_of_method, width, color="#3498db", bottom=1000)
 
@@ -125,9 +130,8 @@ def performance_of_tuning(data, plotting_configuration: PlottingConfiguration) -
             if plotting_configuration.log:
                 log_appendix = "_log"
             #
-            plt.savefig(
-                f"{plotting_configuration.output}/{plotting_configuration.name}{method}{run}{log_appendix}_speedup_per_tuning.{plotting_configuration.format}",
-                dpi=plotting_configuration.dpi)
+            plotting_configuration.savefig(
+                f"{plotting_configuration.output}/{plotting_configuration.name}{method}{run}{log_appendix}_speedup_per_tuning.{plotting_configuration.format}")
 
 
 def speedup_tuning_each(data, plotting_configuration: PlottingConfiguration) -> None:
@@ -200,9 +204,8 @@ def speedup_tuning_each(data, plotting_configuration: PlottingConfiguration) ->
             if plotting_configuration.log:
                 log_appendix = "_log"
 
-            plt.savefig(
-                f"{plotting_configuration.output}/{plotting_configuration.name}{method}{run}{log_appendix}_speedup_per_tuning.{plotting_configuration.format}",
-                dpi=plotting_configuration.dpi)
+            plotting_configuration.savefig(
+                f"{plotting_configuration.output}/{plotting_configuration.name}{method}{run}{log_appendix}_speedup_per_tuning.{plotting_configuration.format}")
 
             # plt.show()
 
@@ -303,9 +306,8 @@ def speedup_tuning_average(data, plotting_configuration: PlottingConfiguration)
     if plotting_configuration.log:
         log_appendix = "_log"
 
-    plt.savefig(
-        f"{plotting_configuration.output}/{plotting_configuration.name}{log_appendix}_speedup_per_tuning.{plotting_configuration.format}",
-        dpi=plotting_configuration.dpi)
+    plotting_configuration.savefig(
+        f"{plotting_configuration.output}/{plotting_configuration.name}{log_appendix}_speedup_per_tuning.{plotting_configuration.format}")
 
     return None
 
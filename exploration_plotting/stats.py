@@ -4,110 +4,184 @@ from __future__ import annotations
 from typing import (
     List,
     Dict,
+    Tuple,
     TYPE_CHECKING
 )
 
 if TYPE_CHECKING:
     from plotting_configuration import PlottingConfiguration
 
+from concurrent.futures import ProcessPoolExecutor
+
 import util
+import performance_evolution_kernel
 import csv
 
+import numpy as np
+
+# columns read for the statistics
+stats_columns: List[str] = ['runtime', 'rewrite', 'error-level', 'executions', 'timestamp']
+
+
+class RunStatistics:
+    """
+    Statistics of one run, accumulated over chunks of samples in a single pass.
+    """
+
+    def __init__(self) -> None:
+
+        # samples
+        self.samples: int = 0
+        self.valid_samples: int = 0
+        self.executed_samples: int = 0
+        self.successful_executions: int = 0
+        self.total_executions: int = 0
+
+        # tuning runs/rewrites
+        self.tuning_runs: int = 0
+        self.invalid_rewrites: int = 0
+
+        # minimum & maximum of the valid samples
+        self.minimum: float = np.inf
+        self.maximum: float = -np.inf
+        self.minimum_index: int = -1
+
+        # first runtime (for the speedup) and duration
+        self.first_runtime: float = np.nan
+        self.start: float = np.nan
+        self.end: float = np.nan
+
+        # tuning run at the end of the last chunk, it might continue in the next chunk
+        self.last_rewrite: str | None = None
+        self.last_invalid: bool = False
+
+    def update(self, chunk: util.RunData) -> None:
+
+        length: int = len(chunk)
+        if length == 0:
+            return None
+
+        runtime: np.ndarray = chunk.runtime
+        error_none: np.ndarray = chunk.is_error_level('None')
+
+        # samples that are either valid or have an execution error
+        executed: np.ndarray = chunk.matches('error-level', lambda value: value == "None" or "EXECUTION_ERROR" in value)
+        self.executed_samples += int(np.sum(executed))
+        self.successful_executions += int(np.sum(error_none))
+        self.total_executions += int(np.sum(chunk.executions[executed], dtype=np.int64))
+
+        # minimum & maximum, first occurrence of a new minimum
+        valid: np.ndarray = runtime != -1
+        self.valid_samples += int(np.sum(valid))
+        if np.any(valid):
+            local: int = int(np.argmin(np.where(valid, runtime, np.inf)))
+            if runtime[local] < self.minimum:
+                self.minimum = float(runtime[local])
+                self.minimum_index = self.samples + local
+            self.maximum = max(self.maximum, float(np.max(runtime[valid])))
+
+        if self.samples == 0:
+            self.first_runtime = float(runtime[0])
+            self.start = float(chunk.timestamp[0])
+        self.end = float(chunk.timestamp[-1])
+
+        # if all samples of a tuning run are invalid, the rewrite is considered invalid
+        groups_invalid: np.ndarray = chunk.reduce_groups(np.logical_and, ~error_none)
+        if self.last_rewrite is not None and self.last_rewrite == chunk.value('rewrite', 0):
+            groups_invalid[0] &= self.last_invalid
+        elif self.last_rewrite is not None:
+            self.tuning_runs += 1
+            self.invalid_rewrites += int(self.last_invalid)
+
+        # the last tuning run is counted when the next one starts (or at the end)
+        self.tuning_runs += len(groups_invalid) - 1
+        self.invalid_rewrites += int(np.sum(groups_invalid[:-1]))
+        self.last_rewrite = chunk.value('rewrite', length - 1)
+        self.last_invalid = bool(groups_invalid[-1])
+
+        self.samples += length
+
+        return None
+
+    def finish(self) -> RunStatistics:
+        if self.last_rewrite is not None:
+            self.tuning_runs += 1
+            self.invalid_rewrites += int(self.last_invalid)
+            self.last_rewrite = None
+
+        return self
+
+    def row(self, method: str, run_counter: int) -> List[str | int | float]:
+
+        speedup: float = self.first_runtime / self.minimum
+        minimum_index_percent: float = (self.minimum_index / self.samples) * 100
+        duration: float = (self.end - self.start) / 1000 / 60 / 60
+        valid_samples_fraction: float = self.valid_samples / self.samples * 100
+        valid_rewrites: int = self.tuning_runs - self.invalid_rewrites
+        valid_rewrites_fraction: float = valid_rewrites / self.tuning_runs * 100
+
+        # TODO fix GFLOP computation 
+        return [
+            method,
+            run_counter,
+            self.samples,
+            self.valid_samples,
+            f"{valid_samples_fraction:.2f}",
+            self.tuning_runs,
+            valid_rewrites,
+            f"{valid_rewrites_fraction:.2f}",
+            f"{duration:.2f}",
+            self.minimum,
+            f"{performance_evolution_kernel.get_gflops(self.minimum):.4f}",
+            self.maximum,
+            f"{performance_evolution_kernel.get_gflops(self.maximum):.5}",
+            f"{speedup:.2f}",
+            self.minimum_index,
+            f"{minimum_index_percent:.2f}"
+        ]
+
+
+# no staticmethod, has to be picklable for worker processes 
+def compute_run_statistics(path: str) -> RunStatistics:
+
+    # stream the run in chunks, memory is bounded by the chunk size
+    statistics: RunStatistics = RunStatistics()
+    for chunk in util.read_file_chunks(path, columns=stats_columns):
+        statistics.update(chunk)
+
+    return statistics.finish()
+
+
 @staticmethod
 def stats(plotting_configuration: PlottingConfiguration) -> None:
-    exploration_data: util.ExplorationData = util.get_data_fully(plotting_configuration.input)
 
     # TODO think about more metrics
 
-    total_executions: int = 0
-    execution_counter: int =  0
-    successful_execution_counter: int = 0
-    total_samples_counter: int = 0
-    valid_samples_counter: int = 0
+    # runs of all methods, in the order used by all plots
+    runs: List[Tuple[str, str, str]] = util.list_run_files(plotting_configuration.input)
+    paths: List[str] = [path for (_, _, path) in runs]
+
+    # one pass over each run, runs are independent
+    statistics: List[RunStatistics] = []
+    if plotting_configuration.jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=plotting_configuration.jobs) as executor:
+            statistics = list(executor.map(compute_run_statistics, paths))
+    else:
+        statistics = [compute_run_statistics(path) for path in paths]
 
     # process stats
     runs_stats: Dict[str, List[str | int | float]] = {}
-    for method in exploration_data:
-        run_counter: int = 0
-
-        for run in exploration_data[method][1]:
-            # samples
-            samples: int = len(exploration_data[method][1][run])
-
-
-            # get valid samples 
-
-            # filter samples 
-            executions: list[Dict[str, str]] = list(filter(lambda x: x['error-level'] == "None" or "EXECUTION_ERROR" in x['error-level'], exploration_data[method][1][run]))
-            successful_executions: list[Dict[str, str]] = list(filter(lambda x: x['error-level'] == "None", exploration_data[method][1][run]))
-
-            # [sample['error-level'] == "None" for sample in exploration_data[method][1][run]]
-
-            # get samples that are either valid or have an execution error 
-            total_samples_counter += samples
-            execution_counter += len(executions)
-            successful_execution_counter += len(successful_executions)
-
-            total_executions += sum([int(sample['executions ']) for sample in executions])
-
-            # tuning_runs/rewrites
-            grouped_by_tuning: List[List[Dict[str, str]]] = util.group_by_tuning(exploration_data[method][1][run])
-            tuning_runs: int = len(grouped_by_tuning)
-
-            # minimum & maximum
-            numbers: List[float] = [float(elem['runtime']) for elem in exploration_data[method][1][run]]
-            minimum: float = min(list(filter(lambda x: (x != -1), numbers)))
-            maximum: float = max(list(filter(lambda x: (x != -1), numbers)))
-            speedup: float = numbers[0] / minimum
-            # speedup = plotting_configuration.default / minimum
-            minimum_index: int = numbers.index(minimum)
-            minimum_index_percent: float = (minimum_index / samples) * 100
-
-            # duration
-            start: float = float(exploration_data[method][1][run][0]['timestamp'])
-            end: float = float(exploration_data[method][1][run][-1]['timestamp'])
-            duration: float = (end - start) / 1000 / 60 / 60
-
-            # invalids
-            # len(list(filter([])))
-            valid_samples: int = len([item for item in numbers if item != -1])
-            valid_samples_fraction: float = valid_samples / len(numbers) * 100
-
-            valid_samples_counter += valid_samples
-
-            # if all samples of a tuning run are invalid, the rewrites is considered invalid
-            invalid_rewrites: int = 0
-            for group in grouped_by_tuning:
-                invalid: List[Dict[str, str]] = [elem for elem in group if elem['error-level'] != 'None']
-                if len(invalid) == len(group):
-                    invalid_rewrites += 1
-
-            valid_rewrites: int = tuning_runs - invalid_rewrites
-
-            valid_rewrites_fraction: float = valid_rewrites / tuning_runs * 100
-
-            # add stats
-            # TODO fix GFLOP computation 
-            runs_stats[f"{method}_{run}"] = [
-                method,
-                run_counter,
-                samples,
-                valid_samples,
-                f"{valid_samples_fraction:.2f}",
-                tuning_runs,
-                valid_rewrites,
-                f"{valid_rewrites_fraction:.2f}",
-                f"{duration:.2f}",
-                minimum,
-                f"{util.get_gflops(minimum):.4f}",
-                maximum,
-                f"{util.get_gflops(maximum):.5}",
-                f"{speedup:.2f}",
-                minimum_index,
-                f"{minimum_index_percent:.2f}"
-            ]
-            run_counter += 1
-
+    run_counters: Dict[str, int] = {}
+    for ((method, run, _), run_statistics) in zip(runs, statistics):
+        run_counter: int = run_counters.get(method, 0)
+        runs_stats[f"{method}_{run}"] = run_statistics.row(method, run_counter)
+        run_counters[method] = run_counter + 1
+
+    total_samples_counter: int = sum([run_statistics.samples for run_statistics in statistics])
+    valid_samples_counter: int = sum([run_statistics.valid_samples for run_statistics in statistics])
+    execution_counter: int = sum([run_statistics.executed_samples for run_statistics in statistics])
+    successful_execution_counter: int = sum([run_statistics.successful_executions for run_statistics in statistics])
+    total_executions: int = sum([run_statistics.total_executions for run_statistics in statistics])
 
     print(f"benchmark: {plotting_configuration.name}")
     print(f"total samples: {total_samples_counter}")
@@ -12,12 +12,16 @@ if TYPE_CHECKING:
     from plotting_configuration import PlottingConfiguration
 
 import util
+import segments
 from scipy.stats import sem # type: ignore
 import math
 import numpy as np
 from matplotlib import pyplot as plt
 from matplotlib.ticker import LogFormatter
 
+# largest tuning budget of the sweep, if not given by -li/--limit
+default_budget: int = 50
+
 @staticmethod
 def tuning_budget_analysis(plotting_configuration: PlottingConfiguration) -> None:
     # mean_speedup_relative(plotting_configuration)
@@ -27,7 +31,10 @@ def tuning_budget_analysis(plotting_configuration: PlottingConfiguration) -> Non
 @staticmethod
 def mean_speedup_relative(plotting_configuration: PlottingConfiguration) -> None:
     # get data an group by tuning runs 
-    multiple_exploration_data: util.MultipleExplorationData = util.get_multiple_data_fully(plotting_configuration.input)
+    multiple_exploration_data: util.MultipleExplorationData = util.get_multiple_data_fully(plotting_configuration.input, plotting_configuration.jobs, ['runtime', 'rewrite'])
+
+    # largest tuning budget to sweep
+    budget: int = plotting_configuration.limit if plotting_configuration.limit else default_budget
 
     plt.clf()
     plt.figure( # type: ignore
@@ -42,7 +49,7 @@ def mean_speedup_relative(plotting_configuration: PlottingConfiguration) -> None
     plt.title(f"Mean Of Relative Speedup For All Tuning Runs", fontsize=plotting_configuration.fontsize) # type: ignore 
     plt.xlabel("Tuning Samples") # type: ignore
     plt.ylabel("Fraction Of Relative Speedup Within Each Tuning Run") # type: ignore 
-    plt.xlim(left=0, right=50) # type: ignore
+    plt.xlim(left=0, right=budget) # type: ignore
     plt.ylim(bottom=0, top=1.01) # type: ignore
     plt.tight_layout() # type: ignore
 
@@ -55,11 +62,10 @@ def mean_speedup_relative(plotting_configuration: PlottingConfiguration) -> None
             # otherwise, plot as separate lines 
         for run in multiple_exploration_data[exploration_data][method][1]:
 
-            # TODO: extract this automatically
-            limits: List[int] = list(range(1, 51))
+            # sweep all budgets, each budget is a column of the prefix minimum matrix
+            limits: List[int] = list(range(1, budget + 1))
 
-            grouped_by_tuning: List[List[Dict[str, str]]] = util.group_by_tuning(multiple_exploration_data[exploration_data][method][1][run])
-            plot_average_relative_speedup(grouped_by_tuning=grouped_by_tuning, limits=limits, name=f"{exploration_data}", axes=plt)
+            plot_average_relative_speedup(run=multiple_exploration_data[exploration_data][method][1][run], limits=limits, name=f"{exploration_data}", axes=plt)
 
 
     # hline with 95 percent 
@@ -75,9 +81,8 @@ def mean_speedup_relative(plotting_configuration: PlottingConfiguration) -> None
     log_appendix: str = ""
     if plotting_configuration.log:
         log_appendix = "_log"
-    plt.savefig( # type: ignore
-        f"{plotting_configuration.output}/{plotting_configuration.name}_relative{log_appendix}.{plotting_configuration.format}",
-        dpi=plotting_configuration.dpi)
+    plotting_configuration.savefig(
+        f"{plotting_configuration.output}/{plotting_configuration.name}_relative{log_appendix}.{plotting_configuration.format}")
 
     return None
 
@@ -86,7 +91,10 @@ def mean_speedup_relative(plotting_configuration: PlottingConfiguration) -> None
 def mean_speedup_absolute(plotting_configuration: PlottingConfiguration) -> None:
 
     # get data an group by tuning runs 
-    multiple_exploration_data: util.MultipleExplorationData = util.get_multiple_data_fully(plotting_configuration.input)
+    multiple_exploration_data: util.MultipleExplorationData = util.get_multiple_data_fully(plotting_configuration.input, plotting_configuration.jobs, ['runtime', 'rewrite'])
+
+    # largest tuning budget to sweep
+    budget: int = plotting_configuration.limit if plotting_configuration.limit else default_budget
 
     plt.clf()
     test: plt.Figure = plt.figure( # type: ignore
@@ -105,8 +113,8 @@ def mean_speedup_absolute(plotting_configuration: PlottingConfiguration) -> None
     ax1.set_ylabel("Speedup per Tuning Run") # type: ignore 
     ax2.set_ylabel("Proportion of Speedup") # type: ignore
 
-    ax1.set_xlim(left=1, right=50) # type: ignore
-    ax2.set_xlim(left=0, right=50) # type: ignore
+    ax1.set_xlim(left=1, right=budget) # type: ignore
+    ax2.set_xlim(left=0, right=budget) # type: ignore
     ax1.set_ylim(bottom=1, top=1100) # type: ignore
     ax2.set_ylim(bottom=0, top=1.02) # type: ignore
 
@@ -120,12 +128,11 @@ def mean_speedup_absolute(plotting_configuration: PlottingConfiguration) -> None
         # otherwise, plot as separate lines 
         for run in multiple_exploration_data[exploration_data][method][1]:
 
-            # TODO: extract this automatically
-            limits: List[int] = list(range(1, 51))
+            # sweep all budgets, each budget is a column of the prefix minimum matrix
+            limits: List[int] = list(range(1, budget + 1))
 
-            grouped_by_tuning: List[List[Dict[str, str]]] = util.group_by_tuning(multiple_exploration_data[exploration_data][method][1][run])
             plot_average_total_speedup(plotting_configuration=plotting_configuration, 
-                                        grouped_by_tuning=grouped_by_tuning, 
+                                        run=multiple_exploration_data[exploration_data][method][1][run], 
                                         limits=limits, 
                                         name=f"{exploration_data}",
                                         axes=ax1
@@ -141,11 +148,10 @@ def mean_speedup_absolute(plotting_configuration: PlottingConfiguration) -> None
             # otherwise, plot as separate lines 
         for run in multiple_exploration_data[exploration_data][method][1]:
 
-            # TODO: extract this automatically
-            limits: List[int] = list(range(1, 51))
+            # sweep all budgets, each budget is a column of the prefix minimum matrix
+            limits: List[int] = list(range(1, budget + 1))
 
-            grouped_by_tuning: List[List[Dict[str, str]]] = util.group_by_tuning(multiple_exploration_data[exploration_data][method][1][run])
-            plot_average_relative_speedup(grouped_by_tuning=grouped_by_tuning, 
+            plot_average_relative_speedup(run=multiple_exploration_data[exploration_data][method][1][run], 
                                             limits=limits, 
                                             name=f"{exploration_data}",
                                             axes=ax2
@@ -180,19 +186,18 @@ def mean_speedup_absolute(plotting_configuration: PlottingConfiguration) -> None
     if plotting_configuration.log:
         log_appendix = "_log"
 
-    fig.savefig( # type: ignore
-        f"{plotting_configuration.output}/{plotting_configuration.name}{log_appendix}.{plotting_configuration.format}",
-        dpi=plotting_configuration.dpi)
+    plotting_configuration.savefig(
+        f"{plotting_configuration.output}/{plotting_configuration.name}{log_appendix}.{plotting_configuration.format}", figure=fig)
 
     return None
 
 
 @staticmethod
-def plot_average_total_speedup(plotting_configuration: PlottingConfiguration, grouped_by_tuning: List[List[Dict[str, str]]], limits: List[int], name: str, axes) -> None:
+def plot_average_total_speedup(plotting_configuration: PlottingConfiguration, run: util.RunData, limits: List[int], name: str, axes) -> None:
 
     avg_speedup_best: Dict[str, Tuple[float, float]] = get_average_total_speedup_of_all(
         plotting_configuration=plotting_configuration,
-        grouped_by_tuning=grouped_by_tuning, 
+        run=run, 
         limits=limits, 
         )
 
@@ -239,10 +244,10 @@ def get_index_of_portion(values: List[float], portion: float) -> int:
     return -1
 
 @staticmethod
-def plot_average_relative_speedup(grouped_by_tuning: List[List[Dict[str, str]]], limits: List[int], name: str, axes) -> None:
+def plot_average_relative_speedup(run: util.RunData, limits: List[int], name: str, axes) -> None:
 
     avg_speedup_best: Dict[str, Tuple[float, float]] = get_average_relative_speedup_of_all(
-        grouped_by_tuning=grouped_by_tuning, 
+        run=run, 
         limits=limits, 
         )
 
@@ -294,59 +299,44 @@ def plot_average_relative_speedup(grouped_by_tuning: List[List[Dict[str, str]]],
 
 
 @staticmethod
-def average_speedup(grouped_by_tuning: List[List[Dict[str, str]]], limit: int) -> float:
+def average_speedup(run: util.RunData, limit: int) -> float:
 
-    speedups: List[float] = speedup_group(grouped_by_tuning, limit)
-    return sum(speedups) / len(speedups)
+    speedups: np.ndarray = speedup_group(run, limit)
+    return float(np.mean(speedups))
 
 
 @staticmethod
-def speedup_group(grouped_by_tuning: List[List[Dict[str, str]]], limit: int) -> List[float]:
+def speedup_group(run: util.RunData, limit: int) -> np.ndarray:
 
-    speedups: List[float] = []  
-    for group in grouped_by_tuning:
+    tuning_runs: segments.Segments = segments.Segments.from_run(run)
 
-        # if group[0]'valid'] 
-        if float(group[0]['runtime']) != -1:
+    # only tuning runs with a valid first sample 
+    baseline: np.ndarray = tuning_runs.runtime[tuning_runs.starts]
+    valid: np.ndarray = baseline != -1
 
-            baseline: float = float(group[0]['runtime'])
-            minimum: float = min(list(filter(lambda x: x != -1, [float(sample['runtime']) for sample in group[:limit]])))
+    minimum: np.ndarray = tuning_runs.prefix_minimum([limit])[:, 0]
 
-            speedup: float = baseline / minimum
-            speedups.append(speedup)
-
-    return speedups
+    return baseline[valid] / minimum[valid]
 
 @staticmethod
-def total_speedups(grouped_by_tuning: List[List[Dict[str, str]]], limits: List[int]) -> Dict[str, float]:
-    return dict([(str(limit), math.prod(rs)) for limit, rs in [(limit, relevant_speedup(grouped_by_tuning, limit)) for limit in limits]])
+def total_speedups(run: util.RunData, limits: List[int]) -> Dict[str, float]:
+    return dict([(str(limit), math.prod(rs)) for limit, rs in [(limit, relevant_speedup(run, limit).tolist()) for limit in limits]])
 
 
 @staticmethod
-def relevant_speedup(grouped_by_tuning: List[List[Dict[str, str]]], limit: int) -> List[float]:
+def relevant_speedup(run: util.RunData, limit: int) -> np.ndarray:
     # identify important rewrites/tuning runs 
-    minimum: float = float(grouped_by_tuning[0][0]['runtime'])
-
-    speedups_relevant: List[float] = []
-
-    for group in grouped_by_tuning:
-
-        # filter out invalid samples 
-        filtered: list[float] = list(filter(lambda x: x != -1, [float(sample['runtime']) for sample in group[:limit]]))
+    # a tuning run is relevant if it finds a new minimum within the limit
+    tuning_runs: segments.Segments = segments.Segments.from_run(run)
 
-        # check if we have valid samples
-        if len(filtered) != 0:
+    minima: np.ndarray = tuning_runs.prefix_minimum([limit])[:, 0]
+    minima = np.where(np.isnan(minima), np.inf, minima)
 
-            # check group is relevant (we find a new minimum) 
-            if min(filtered) < minimum:
+    # minimum before each tuning run, starting with the first sample
+    previous: np.ndarray = np.minimum.accumulate(np.concatenate(([tuning_runs.runtime[0]], minima)))[:-1]
+    relevant: np.ndarray = minima < previous
 
-                old_min: float = minimum
-                minimum = min(filtered)
-
-                speedup: float = old_min / minimum
-                speedups_relevant.append(speedup)
-           
-    return speedups_relevant
+    return previous[relevant] / minima[relevant]
 
 @staticmethod
 def get_speedup_of_tuning_runs(grouped_by_tuning: List[List[Dict[str, str]]], limits: List[int]) -> List[Dict[int, float]]:
@@ -392,103 +382,58 @@ def get_speedup_of_tuning_runs(grouped_by_tuning: List[List[Dict[str, str]]], li
     return speedup_group
 
 @staticmethod
-def get_first_valid_elem(group: List[float]) -> float:
-
-    for elem in group:
-        if(elem != -1):
-            return elem
-
-    return -1
-
-@staticmethod
-def get_average_total_speedup_of_all(plotting_configuration: PlottingConfiguration, grouped_by_tuning: List[List[Dict[str, str]]], limits: List[int]) -> Dict[str, Tuple[float, float]]:
-
-    # get baseline for speedup calculation and best amount groups
-    groups: List[List[float]] = [list(map(lambda x: float(x['runtime']), group)) for group in grouped_by_tuning]
-    groups = list(filter(lambda x: len(list(filter(lambda y: y != -1, x))) > 0, groups))
-
-    speedup_fraction: Dict[str, List[float]] = {}
-
-    groups = list(filter(lambda x: len(list(filter(lambda y: y != -1, x))) > 0, groups))
-
-    for limit in limits:
-
-        speedup_limit: List[float] = []
-
-        # get speedup until limit for each group 
-        for group in groups:
-
-            # check if we have valid samples for this limit 
-            if len(list(filter(lambda x: x != -1, group[:limit]))) > 0:
+def get_average_total_speedup_of_all(plotting_configuration: PlottingConfiguration, run: util.RunData, limits: List[int]) -> Dict[str, Tuple[float, float]]:
 
-                # use first valid element of group as baseline to compute speedups 
-                group_baseline: float = get_first_valid_elem(group)
-
-                # compute speedup 
-                minimum: float = min(list(filter(lambda x: x != -1, group[:limit])))
-                speedup_limit.append(group_baseline/minimum)
+    # filter all tuning runs that are completely invalid 
+    tuning_runs: segments.Segments = segments.Segments.from_run(run)
+    valid: np.ndarray = tuning_runs.valid_count() > 0
 
-            else:
-                # if no valid element is found, we append a speedup of 1 to the list
-                speedup_limit.append(1)
+    # groups x limits, minimum until limit for each group 
+    minima: np.ndarray = tuning_runs.prefix_minimum(limits)[valid]
 
-        speedup_fraction[str(limit)] = speedup_limit
-        
-    # compute average and confidence interval 
-    averge_speedup_per_limit: Dict[str, Tuple[float, float]] = {}
+    # use first valid element of group as baseline to compute speedups 
+    # if no valid element is found until the limit, the speedup is 1
+    group_baseline: np.ndarray = tuning_runs.first_valid()[valid]
+    speedup_fraction: np.ndarray = np.where(np.isnan(minima), 1.0, group_baseline[:, None] / minima)
 
     # convert to log
     if plotting_configuration.log: 
-        for limit in limits:
-            speedup_fraction[str(limit)] = [np.log10(elem) for elem in speedup_fraction[str(limit)] if elem != 0]
+        speedup_fraction = np.log10(speedup_fraction)
 
-    # compute mean and confidence interval
-    for limit in limits:
-        averge_speedup_per_limit[str(limit)] = (
-            float(np.mean(speedup_fraction[str(limit)])),
-            sem(speedup_fraction[str(limit)]) * 1.96
-            )
+    # compute average and confidence interval for all limits
+    means: np.ndarray = np.mean(speedup_fraction, axis=0)
+    confidence: np.ndarray = sem(speedup_fraction, axis=0) * 1.96
+
+    averge_speedup_per_limit: Dict[str, Tuple[float, float]] = {}
+    for (index, limit) in enumerate(limits):
+        averge_speedup_per_limit[str(limit)] = (float(means[index]), confidence[index])
 
     return averge_speedup_per_limit
 
 
 @staticmethod
-def get_average_relative_speedup_of_all(grouped_by_tuning: List[List[Dict[str, str]]], limits: List[int]) -> Dict[str, Tuple[float, float]]:
+def get_average_relative_speedup_of_all(run: util.RunData, limits: List[int]) -> Dict[str, Tuple[float, float]]:
 
-    groups: List[List[float]] = [list(map(lambda x: float(x['runtime']), group)) for group in grouped_by_tuning]
-    groups = list(filter(lambda x: len(list(filter(lambda y: y != -1, x))) > 0, groups))
-    speedup_fraction: Dict[str, List[float]] = {}
-
-    for limit in limits:
-
-        speedup_limit: List[float] = []
-
-        # get speedup until limit for each group 
-        for group in groups:
+    # filter all tuning runs that are completely invalid 
+    tuning_runs: segments.Segments = segments.Segments.from_run(run)
+    valid: np.ndarray = tuning_runs.valid_count() > 0
 
-            if len(list(filter(lambda x: x != -1, group[:limit]))) > 0:
+    # groups x limits, minimum until limit for each group 
+    minima: np.ndarray = tuning_runs.prefix_minimum(limits)[valid]
 
-                # use global baseline or first valid element of group to compute speedups 
-                group_baseline: float = get_first_valid_elem(group)
+    # speedup until limit relative to the speedup of the whole group 
+    # (group_baseline/minimum)/(group_baseline/group_minimum), independent of the baseline
+    # if no valid element exits until the limit, the speedup is 0
+    group_minimum: np.ndarray = tuning_runs.minimum()[valid]
+    speedup_fraction: np.ndarray = np.where(np.isnan(minima), 0.0, group_minimum[:, None] / minima)
 
-                # compute speedup 
-                base_min: float = group_baseline/min(list(filter(lambda x: x != -1, group)))
-                minimum: float = min(list(filter(lambda x: x != -1, group[:limit])))
-                speedup_limit.append((group_baseline/minimum)/base_min)
+    # compute average and confidence interval for all limits
+    means: np.ndarray = np.mean(speedup_fraction, axis=0)
+    confidence: np.ndarray = sem(speedup_fraction, axis=0) * 1.96
 
-            else:
-                # if no valid elemnt exits, we append a speedup of 0 to the list
-                speedup_limit.append(0)
-
-        speedup_fraction[str(limit)] = speedup_limit
-        
-    # compute average and confidence interval 
     averge_speedup_per_limit: Dict[str, Tuple[float, float]] = {}
-    for limit in limits:
-        averge_speedup_per_limit[str(limit)] = (
-            float(np.mean(speedup_fraction[str(limit)])),
-            sem(speedup_fraction[str(limit)]) * 1.96
-            )
+    for (index, limit) in enumerate(limits):
+        averge_speedup_per_limit[str(limit)] = (float(means[index]), confidence[index])
 
     return averge_speedup_per_limit
 
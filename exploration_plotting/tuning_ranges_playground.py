@@ -17,6 +17,10 @@ import numpy as np
 from scipy.stats import sem # type: ignore
 
 import util
+import performance_evolution_kernel
+import density
+import artists
+import figure_pool
 from matplotlib.ticker import LogFormatter
 from matplotlib.ticker import FuncFormatter
 
@@ -33,18 +37,20 @@ limits: List[int] = [1, 10, 20, 30, 40, 50]
 
 def tuning_ranges_dots(plotting_configuration: PlottingConfiguration) -> None:
 
-    multiple_exploration_data: util.MultipleExplorationData = util.get_multiple_data_fully(plotting_configuration.input)
+    multiple_exploration_data: util.MultipleExplorationData = util.get_multiple_data_fully(plotting_configuration.input, plotting_configuration.jobs, ['runtime', 'rewrite'])
+
+    # dots of each benchmark, one figure per benchmark
+    figures: List[Tuple[str, List[Tuple[Dots, List[Dots]]]]] = []
 
-    benchmark_counter = 0
     # for benchmark in multiple_exploration_data:
     for benchmark in sorted(multiple_exploration_data.keys()):
 
-        tuning_ranges_dots_benchmark(plotting_configuration = plotting_configuration, 
-                                     benchmark = benchmark,
-                                     benchmark_data = multiple_exploration_data[benchmark],
-                                     )
-        benchmark_counter += 1
+        print(f"benchmark: {benchmark}")
+        figures.append((benchmark, tuning_ranges_dots_data(benchmark_data = multiple_exploration_data[benchmark])))
+        print("\n")
 
+    # figures are independent, rendered in parallel with multiple jobs
+    figure_pool.render(plotting_configuration, tuning_ranges_dots_benchmark, figures)
 
     return None
 
@@ -67,32 +73,27 @@ left_right: Dict[str, Tuple[float, float]] = {
     "scal" : (0, 1000),
 }                                   
 
-# with data and benchmark key 
-def tuning_ranges_dots_benchmark(plotting_configuration: PlottingConfiguration, 
-                                 benchmark: str, 
-                                 benchmark_data: util.ExplorationData,
-                                 ) -> None:
+# x (tuning runs) and y (runtimes) of dots
+Dots = Tuple[List[float], List[float]]
+
+def tuning_ranges_dots_data(benchmark_data: util.ExplorationData) -> List[Tuple[Dots, List[Dots]]]:
 
     # implement tuning ranges with dots here
 
     exhaustive: util.MethodData = benchmark_data['Exhaustive'][1]
 
-    # create plot with axis and grid 
-    plt.clf()
-    plt.figure( # type: ignore
-        figsize=(20, 12),  # is this ignored?
-        dpi=plotting_configuration.dpi
-    )
-    fig, axes = plt.subplots(2, 3, figsize=(16, 8))  # 2 rows, 2 column # type: ignore
-
-    limit_counter: int = 0
-
-    print(f"benchmark: {benchmark}")
+    # tuning runs of each run, shared by all limits
+    tuning_runs_of_runs: List[List[util.TuningRunData]] = [util.group_by_tuning(exhaustive[run]) for run in exhaustive]
 
+    # for each limit: dots of all runs and colored dots of each run
+    dots_for_limits: List[Tuple[Dots, List[Dots]]] = []
     for limit in limits: 
-        for run in exhaustive:
+        # dots of all runs, density binned together for many dots
+        normal: Dots = ([], [])
+        colored: List[Dots] = []
+
+        for tuning_runs in tuning_runs_of_runs:
             # print(f"run: {run} for lmit: {limit}")
-            tuning_runs: List[util.TuningRunData] = util.group_by_tuning(exhaustive[run])
 
             # dots: Tuple[List[float], List[float]] = plot_dots_limit(tuning_runs=tuning_runs, limit=limit)
             dots: Dict[str, Tuple[List[float], List[float]]] = plot_dots_limit_colored(tuning_runs=tuning_runs, limit=limit, color_limit=10)
@@ -101,37 +102,69 @@ def tuning_ranges_dots_benchmark(plotting_configuration: PlottingConfiguration,
 
             # dots_colored: List[float] = sorted(dots[1])[:10]
 
-            # plot means 
-            axes.flat[limit_counter].scatter( # type: ignore
-                dots["normal"][0], 
-                dots['normal'][1], 
-                color='#1a5e92', 
-                alpha=0.9, 
-                s=1,  # size of the dots
-                label=f"{limit}"
-            )
+            normal[0].extend(dots['normal'][0])
+            normal[1].extend(dots['normal'][1])
+            colored.append(dots['colored'])
+
+        dots_for_limits.append((normal, colored))
+
+    return dots_for_limits
+
 
+# with data and benchmark key 
+# no staticmethod, has to be picklable for worker processes
+def tuning_ranges_dots_benchmark(plotting_configuration: PlottingConfiguration, 
+                                 benchmark: str, 
+                                 dots_for_limits: List[Tuple[Dots, List[Dots]]],
+                                 ) -> None:
+
+    # create plot with axis and grid 
+    plt.clf()
+    plt.figure( # type: ignore
+        figsize=(20, 12),  # is this ignored?
+        dpi=plotting_configuration.dpi
+    )
+    fig, axes = plt.subplots(2, 3, figsize=(16, 8))  # 2 rows, 2 column # type: ignore
+
+    limit_counter: int = 0
+
+    for (limit, (normal, colored)) in zip(limits, dots_for_limits): 
+
+        for dots in colored:
             axes.flat[limit_counter].scatter( # type: ignore
-                dots['colored'][0], 
-                dots['colored'][1], 
+                dots[0], 
+                dots[1], 
                 color='red', 
                 alpha=0.9, 
                 s=2,  # size of the dots
                 label=f"{limit}"
             )
 
-            axes.flat[limit_counter].set_xlim(left=left_right[benchmark][0], right=left_right[benchmark][1]) # type: ignore
-            axes.flat[limit_counter].set_ylim(bottom=bottom_top[benchmark][0], top=bottom_top[benchmark][1]) # type: ignore
-
-            axes.flat[limit_counter].set_yscale('log') # type: ignore 
-            axes.flat[limit_counter].yaxis.set_major_formatter(FuncFormatter(util.log_formatter)) # type: ignore
-
-            axes.flat[limit_counter].legend() # type: ignore
+        # plot means, below the colored dots of the runs
+        density.scatter(axes.flat[limit_counter],
+            normal[0], 
+            normal[1], 
+            threshold=plotting_configuration.density_threshold,
+            dpi=plotting_configuration.dpi,
+            extent=(left_right[benchmark][0], left_right[benchmark][1], bottom_top[benchmark][0], bottom_top[benchmark][1]),
+            log_y=True,
+            color='#1a5e92', 
+            alpha=0.9, 
+            s=1,  # size of the dots
+            label=f"{limit}",
+            zorder=0.5,
+        )
+
+        axes.flat[limit_counter].set_xlim(left=left_right[benchmark][0], right=left_right[benchmark][1]) # type: ignore
+        axes.flat[limit_counter].set_ylim(bottom=bottom_top[benchmark][0], top=bottom_top[benchmark][1]) # type: ignore
+
+        axes.flat[limit_counter].set_yscale('log') # type: ignore 
+        axes.flat[limit_counter].yaxis.set_major_formatter(FuncFormatter(util.log_formatter)) # type: ignore
+
+        axes.flat[limit_counter].legend() # type: ignore
 
         limit_counter += 1
 
-    print("\n")
-
     # create plot 
     plt.tight_layout() # type: ignore
 
@@ -140,9 +173,8 @@ def tuning_ranges_dots_benchmark(plotting_configuration: PlottingConfiguration,
     if plotting_configuration.log:
         log_appendix = "_log"
 
-    plt.savefig( # type: ignore
-        f"{plotting_configuration.output}/{plotting_configuration.name}_dots_{benchmark}{log_appendix}.{plotting_configuration.format}",
-        dpi=plotting_configuration.dpi)
+    plotting_configuration.savefig(
+        f"{plotting_configuration.output}/{plotting_configuration.name}_dots_{benchmark}{log_appendix}.{plotting_configuration.format}")
 
     pass
 
@@ -223,7 +255,7 @@ def plot_dots_limit(tuning_runs: List[util.TuningRunData], limit: int) -> Tuple[
 
 def tuning_ranges_bars(plotting_configuration: PlottingConfiguration) -> None:  
     # get data an group after tuning 
-    exploration_data: util.ExplorationData = util.get_data_fully(plotting_configuration.input)
+    exploration_data: util.ExplorationData = util.get_data_fully(plotting_configuration.input, plotting_configuration.jobs, ['runtime', 'rewrite'])
 
     # set x and y range for all plots at least for one method 
     # set dynamic size of plots width, height, line-width
@@ -372,7 +404,7 @@ def tuning_ranges_bars(plotting_configuration: PlottingConfiguration) -> None:
             plt.xlabel("Rewrites/Tuning Runs") # type: ignore
             plt.ylabel("Runtime (ms) log" if plotting_configuration.log else "Runtime (ms)") # type: ignore 
             # plt.ylim(10**-6, 10)
-            plt.bar(x=x, height=values_max, bottom=values_min, width=0.5, alpha=0.8, color=colors_values, label=f"Performance Range") # type: ignore
+            artists.bars(ax, x=x, height=values_max, bottom=values_min, width=0.5, alpha=0.8, facecolors=colors_values, label=f"Performance Range")
 
             # add line for performance evolution
             ax.set_yscale('log') # type: ignore 
@@ -382,23 +414,19 @@ def tuning_ranges_bars(plotting_configuration: PlottingConfiguration) -> None:
 
             # add a scatter plot for all points
 
-            x: List[int] = list(range(len(points_for_run)))
+            # one collection for the points of all tuning runs
+            artists.points(ax, points_for_run, color='red', s=3)
 
-            for run in x:
-                
-                x_coordinates: list[int] = [run for _ in range(len(points_for_run[run]))]
-                plt.scatter(x_coordinates, points_for_run[run], color='red', s=3) # type: ignore
-                
                     
             # plot expert 
             if plotting_configuration.expert:
 
                 if plotting_configuration.log:
                     expert: float = np.log10(
-                        plotting_configuration.expert if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                        plotting_configuration.expert if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                             plotting_configuration.expert))
                 else:
-                    expert: float= plotting_configuration.expert if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                    expert: float= plotting_configuration.expert if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                         plotting_configuration.expert)
 
                 plt.axhline(y=expert, color='black', linestyle='-', label='Expert', alpha=0.5) # type: ignore 
@@ -408,10 +436,10 @@ def tuning_ranges_bars(plotting_configuration: PlottingConfiguration) -> None:
 
                 if plotting_configuration.log:
                     default: float = np.log10(
-                        plotting_configuration.default if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                        plotting_configuration.default if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                             plotting_configuration.default))
                 else:
-                    default: float = plotting_configuration.default if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                    default: float = plotting_configuration.default if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                         plotting_configuration.default)
 
                 plt.axhline(y=default, color='black', linestyle='-', label='Default', alpha=0.5) # type: ignore 
@@ -438,15 +466,14 @@ def tuning_ranges_bars(plotting_configuration: PlottingConfiguration) -> None:
             invalid_appendix = "_invalid"
 
         plt.tight_layout(pad=2.0)
-        plt.savefig( # type: ignore
-            f"{plotting_configuration.output}/{plotting_configuration.name}_{method}_tuning_ranges_bars_{log_appendix}{invalid_appendix}.{plotting_configuration.format}",
-            dpi=plotting_configuration.dpi)
+        plotting_configuration.savefig(
+            f"{plotting_configuration.output}/{plotting_configuration.name}_{method}_tuning_ranges_bars_{log_appendix}{invalid_appendix}.{plotting_configuration.format}")
 
 
 
 def tuning_ranges_pe(plotting_configuration: PlottingConfiguration) -> None:  
     # get data an group after tuning 
-    exploration_data: util.ExplorationData = util.get_data_fully(plotting_configuration.input)
+    exploration_data: util.ExplorationData = util.get_data_fully(plotting_configuration.input, plotting_configuration.jobs, ['runtime', 'rewrite'])
 
     # set x and y range for all plots at least for one method 
     # set dynamic size of plots width, height, line-width
@@ -664,10 +691,10 @@ def tuning_ranges_pe(plotting_configuration: PlottingConfiguration) -> None:
 
                 if plotting_configuration.log:
                     expert: float = np.log10(
-                        plotting_configuration.expert if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                        plotting_configuration.expert if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                             plotting_configuration.expert))
                 else:
-                    expert: float= plotting_configuration.expert if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                    expert: float= plotting_configuration.expert if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                         plotting_configuration.expert)
 
                 plt.axhline(y=expert, color='black', linestyle='-', label='Expert', alpha=0.5) # type: ignore 
@@ -677,10 +704,10 @@ def tuning_ranges_pe(plotting_configuration: PlottingConfiguration) -> None:
 
                 if plotting_configuration.log:
                     default: float = np.log10(
-                        plotting_configuration.default if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                        plotting_configuration.default if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                             plotting_configuration.default))
                 else:
-                    default: float = plotting_configuration.default if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                    default: float = plotting_configuration.default if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                         plotting_configuration.default)
 
                 plt.axhline(y=default, color='black', linestyle='-', label='Default', alpha=0.5) # type: ignore 
@@ -708,14 +735,13 @@ def tuning_ranges_pe(plotting_configuration: PlottingConfiguration) -> None:
             invalid_appendix = "_invalid"
 
         plt.tight_layout(pad=2.0)
-        plt.savefig( # type: ignore
-            f"{plotting_configuration.output}/{plotting_configuration.name}_{method}_tuning_ranges_pe{log_appendix}{invalid_appendix}.{plotting_configuration.format}",
-            dpi=plotting_configuration.dpi)
+        plotting_configuration.savefig(
+            f"{plotting_configuration.output}/{plotting_configuration.name}_{method}_tuning_ranges_pe{log_appendix}{invalid_appendix}.{plotting_configuration.format}")
 
 
 def tuning_ranges_old(plotting_configuration: PlottingConfiguration) -> None:  
     # get data an group after tuning 
-    exploration_data: util.ExplorationData = util.get_data_fully(plotting_configuration.input)
+    exploration_data: util.ExplorationData = util.get_data_fully(plotting_configuration.input, plotting_configuration.jobs, ['runtime', 'rewrite'])
 
     # set x and y range for all plots at least for one method 
     # set dynamic size of plots width, height, line-width
@@ -957,10 +983,10 @@ def tuning_ranges_old(plotting_configuration: PlottingConfiguration) -> None:
 
                 if plotting_configuration.log:
                     expert: float = np.log10(
-                        plotting_configuration.expert if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                        plotting_configuration.expert if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                             plotting_configuration.expert))
                 else:
-                    expert: float= plotting_configuration.expert if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                    expert: float= plotting_configuration.expert if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                         plotting_configuration.expert)
 
                 plt.axhline(y=expert, color='black', linestyle='-', label='Expert', alpha=0.5) # type: ignore 
@@ -970,10 +996,10 @@ def tuning_ranges_old(plotting_configuration: PlottingConfiguration) -> None:
 
                 if plotting_configuration.log:
                     default: float = np.log10(
-                        plotting_configuration.default if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                        plotting_configuration.default if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                             plotting_configuration.default))
                 else:
-                    default: float = plotting_configuration.default if plotting_configuration.unit == 'runtime' else util.get_gflops(
+                    default: float = plotting_configuration.default if plotting_configuration.unit == 'runtime' else performance_evolution_kernel.get_gflops(
                         plotting_configuration.default)
 
                 plt.axhline(y=default, color='black', linestyle='-', label='Default', alpha=0.5) # type: ignore 
@@ -1004,8 +1030,7 @@ def tuning_ranges_old(plotting_configuration: PlottingConfiguration) -> None:
             invalid_appendix = "_invalid"
 
         plt.tight_layout(pad=2.0)
-        plt.savefig( # type: ignore
-            f"{plotting_configuration.output}/{plotting_configuration.name}_{method}_tuning_ranges{log_appendix}{invalid_appendix}.{plotting_configuration.format}",
-            dpi=plotting_configuration.dpi)
+        plotting_configuration.savefig(
+            f"{plotting_configuration.output}/{plotting_configuration.name}_{method}_tuning_ranges{log_appendix}{invalid_appendix}.{plotting_configuration.format}")
 
 
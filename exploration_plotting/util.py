@@ -7,9 +7,19 @@ from typing import(
     Iterator,
 )
 
+from concurrent.futures import ProcessPoolExecutor
+
 import csv
+import itertools
 import os
 
+import numpy as np
+
+from exploration_table import ExplorationTable, project
+import exploration_cache
+import csv_backends
+import exploration_dataset
+
 # alias for exploration data 
 # improves readability for type annotations  
 RunDataRuntime = List[Tuple[bool, float]]
@@ -18,12 +28,25 @@ MethodDataRuntime = Dict[str, RunDataRuntime]
 ExplorationDataRuntime = Dict[str, Tuple[int, MethodDataRuntime]]
 MultipleExplorationDataRuntime = Dict[str, ExplorationDataRuntime]
 
-RunData = List[Dict[str, str]]
-TuningRunData = List[Dict[str, str]]
+RunData = ExplorationTable
+TuningRunData = ExplorationTable
 MethodData = Dict[str, RunData]
 ExplorationData = Dict[str, Tuple[int, MethodData]]
 MultipleExplorationData = Dict[str, ExplorationData]
 
+# parsed files of this process, shared by all plots of a batch
+loaded_files: Dict[str, RunData] = {}
+
+# columns each file was loaded with (None for all columns)
+loaded_projections: Dict[str, List[str] | None] = {}
+
+# projection of the plots that only use the runtime
+# the column after the runtime (validity) is always part of a projection
+runtime_columns: List[str] = ['runtime']
+
+# samples per batch when reading files in chunks
+chunk_size: int = 65536
+
 # name map
 names_map: Dict[str, str] = {
     # benchmarks
@@ -118,23 +141,14 @@ colors: List[str] = [
 def pather(folder: Tuple[str, str]) -> float:
     return os.path.getmtime(folder[1])
 
-# TODO make this a flexible module that can compute GFLOPS for various computations 
 @staticmethod
-def get_gflops(runtime: float) -> float:
-    MatrixSize = 1024
-    NumOps: int = 2 * MatrixSize ** 3
-    gflops: float = 1.0e-9 * NumOps / runtime
+def get_data(input: str, jobs: int = 1) -> ExplorationDataRuntime:
 
-    return gflops
+    # get sub folders from input folder, sorted by their generation time
+    folders: List[Tuple[str, str]] = list_folders(exploration_dataset.resolve_exploration(input))
 
-@staticmethod
-def get_data(input: str) -> ExplorationDataRuntime:
-
-    # get sub folders from input folder
-    folders: List[Tuple[str, str]] = [(f.name, f.path) for f in os.scandir(input) if f.is_dir()]
-
-    # sort folders based on their generation time  
-    folders = sorted(folders, key=pather, reverse=False)
+    # load all csv files at once, only the runtime (and validity) columns are parsed
+    load_files([path for (_, path) in folders], jobs, runtime_columns)
 
     # get data from the sorted input folders
     data: ExplorationDataRuntime = {}
@@ -155,32 +169,9 @@ def get_data(input: str) -> ExplorationDataRuntime:
 def group_by_tuning(run: RunData) -> List[RunData]:
 
     # list of tuning runs 
-    # each tuning run is a list of lines aka dictionary 
-    grouped_by_tuning: List[RunData] = []
-    group: List[Dict[str, str]] = []
-
-    # low_level_hash: str = run[0]['low-level hash']
-    rewrite_sequence: str = run[0]['rewrite']
-
-    for line in run:
-        # check if we have a new group
-        # if low_level_hash != line['low-level hash'] and rewrite_sequence != line['rewrite']:
-        if rewrite_sequence != line['rewrite']:
-            # yes, update identifier
-            # low_level_hash = line['low-level hash']
-            rewrite_sequence = line['rewrite']
-
-            # add elements to group
-            grouped_by_tuning.append(group)
-
-            # reset group
-            group = []
-
-        # otherwise add to group 
-        group.append(line)
-
-    
-    grouped_by_tuning.append(group)
+    # each tuning run is a slice of the run (no copy)
+    # the group offsets are computed once and kept with the run
+    grouped_by_tuning: List[RunData] = run.groups()
 
     return grouped_by_tuning
 
@@ -204,12 +195,11 @@ def get_runtime_index(reader: Iterator[list[str]]) -> int:
 
 @staticmethod
 def process_subfolder(sub_folder: str) -> Dict[str, List[Tuple[bool, float]]]:
-    files: List[str] = os.listdir(sub_folder + "/" + "csv")
+    files: List[str] = list_runs(sub_folder)
 
     fileData: Dict[str, List[Tuple[bool, float]]] = {}
     for f in files:
-        if (f[-3:] == 'csv'):
-            fileData[f] = process_file(sub_folder + "/" + "csv", f)
+        fileData[f] = process_file(get_run_folder(sub_folder), f)
 
     return fileData
 
@@ -217,50 +207,51 @@ def process_subfolder(sub_folder: str) -> Dict[str, List[Tuple[bool, float]]]:
 @staticmethod
 def process_file(sub_folder: str, file: str) -> List[Tuple[bool, float]]:
 
-    # prepare processing 
-    ifd = open(str(sub_folder + '/' + file), mode='r')
-    csv_reader = csv.reader(ifd, delimiter=',')
-    runtime_index: int = get_runtime_index(csv_reader)
-    line_count: int = 0
-    data: List[Tuple[bool, float]] = []
-
-    # process csv file 
-    for row in csv_reader:
-        # don't skip header
-        if line_count == -1:
-            # skip header
-            line_count += 1
-        else:
-            line_count += 1
-
-            if (str(row[runtime_index]) == '-1'):
-                data.append((False, float(2147483647)))
-            elif (str(row[runtime_index + 1]) == 'False'):
-                data.append((False, float(2147483647)))
-            else:
-                data.append((True, float(row[runtime_index])))
+    # use the (cached) table of the file
+    table: RunData = process_file_fully(sub_folder, file, runtime_columns)
+    runtime_index: int = get_runtime_index(iter([table.header]))
+
+    runtime: np.ndarray = table.numeric(table.header[runtime_index])
+    valid: np.ndarray = ~get_invalid(table)
+
+    data: List[Tuple[bool, float]] = list(zip(valid.tolist(), np.where(valid, runtime, float(2147483647)).tolist()))
 
     return data
 
 
 @staticmethod
-def get_multiple_data(input: str) -> MultipleExplorationDataRuntime:
+def get_invalid(run: RunData) -> np.ndarray:
+
+    # invalid if runtime is -1 or the column after the runtime is 'False'
+    runtime_index: int = get_runtime_index(iter([run.header]))
+    invalid: np.ndarray = run.numeric(run.header[runtime_index]) == -1
+    if runtime_index + 1 < len(run.header):
+        invalid |= run.equals(run.header[runtime_index + 1], 'False')
+
+    return invalid
+
+
+@staticmethod
+def get_multiple_data(input: str, jobs: int = 1) -> MultipleExplorationDataRuntime:
 
     # for each exploration folder in the input folder
-    explorations: list[tuple[str, str]] = [(f.name, f.path) for f in os.scandir(input) if f.is_dir()]
-    explorations = sorted(explorations, key=pather, reverse=False)
+    explorations: list[tuple[str, str]] = list_folders(input)
     multiple_data: MultipleExplorationDataRuntime = {}
 
+    # get sub folders from parent folders 
+    exploration_folders: Dict[str, list[tuple[str, str]]] = {}
     for exploration in explorations:
+        exploration_folders[exploration[0]] = list_folders(exploration[1])
 
-        # get sub folders from parent folder 
-        folders: list[tuple[str, str]] = [(f.name, f"{f.path}") for f in os.scandir(f"{input}/{exploration[0]}") if f.is_dir()]
-        folders = sorted(folders, key=pather, reverse=False)
+    # load all csv files at once, only the runtime (and validity) columns are parsed
+    load_files([path for folders in exploration_folders.values() for (_, path) in folders], jobs, runtime_columns)
+
+    for exploration in explorations:
 
         # get data from input folders
         data: ExplorationDataRuntime = {}
         counter: int = 0
-        for (name, path) in folders:
+        for (name, path) in exploration_folders[exploration[0]]:
             data[name] = (counter, process_subfolder(path))
             counter += 1
 
@@ -270,9 +261,9 @@ def get_multiple_data(input: str) -> MultipleExplorationDataRuntime:
 
 
 @staticmethod
-def get_multiple_data_fully_filled(input: str) -> MultipleExplorationData:
+def get_multiple_data_fully_filled(input: str, jobs: int = 1, columns: List[str] | None = None) -> MultipleExplorationData:
 
-    multiple_exploration_data: MultipleExplorationData = get_multiple_data_fully(input)
+    multiple_exploration_data: MultipleExplorationData = get_multiple_data_fully(input, jobs, columns)
 
     # multiple_exploration_data_runtime: MultipleExplorationDataRuntime = {}
 
@@ -290,121 +281,284 @@ def get_multiple_data_fully_filled(input: str) -> MultipleExplorationData:
 @staticmethod
 def fill_up(tuning_runs: List[RunData], length: int) -> RunData:
 
-    tuning_runs_filled: RunData = []
+    tuning_runs_filled: List[RunData] = []
 
 
     for tuning_run in tuning_runs:
 
         # print(f"Length: {len(tuning_run)}")
 
-        tuning_run2: RunData = tuning_run.copy()
+        tuning_run2: RunData = tuning_run
 
         # check if we need to fill up
         if(len(tuning_run) < length):
             print(f"Fill up: {len(tuning_run)}")
-            for _ in range(len(tuning_run), length):
-                # print("Fill up")
-                tuning_run2.append(tuning_run[-1]) 
+
+            # repeat the last sample until length is reached
+            indices: np.ndarray = np.minimum(np.arange(length), len(tuning_run) - 1)
+            tuning_run2 = tuning_run.take(indices)
 
         # add filled tuning run to list
-        for sample in tuning_run2:
-            tuning_runs_filled.append(sample)
+        tuning_runs_filled.append(tuning_run2)
 
     length_total: int = 0
     for tuning_run in tuning_runs:
         length_total += len(tuning_run)
 
+    filled: RunData = ExplorationTable.concatenate(tuning_runs_filled)
+
     print(f"Length: {length_total}")
-    print(f"Length filled: {len(tuning_runs_filled)}")
+    print(f"Length filled: {len(filled)}")
 
-    return tuning_runs_filled
+    return filled
 
 
 @staticmethod
-def get_multiple_data_fully(input: str) -> MultipleExplorationData:
-
-    # for each exploration folder in the input folder
-    explorations: list[tuple[str, str]] = [(f.name, f.path) for f in os.scandir(input) if f.is_dir()]
-    explorations = sorted(explorations, key=pather, reverse=False)
+def get_multiple_data_fully(input: str, jobs: int = 1, columns: List[str] | None = None, load: bool = False) -> MultipleExplorationData:
 
-    multiple_data: MultipleExplorationData = {}
+    # imported here, the corpus itself builds on this module
+    import exploration_corpus
 
-    for exploration in explorations:
+    # index all exploration folders, runs are parsed on first access
+    # only the given columns are parsed (runtime and validity are always included)
+    corpus: exploration_corpus.ExplorationCorpus = exploration_corpus.ExplorationCorpus(input, jobs, columns)
 
-        # get sub folders from parent folder 
-        folders: list[tuple[str, str]] = [(f.name, f"{f.path}") for f in os.scandir(f"{input}/{exploration[0]}") if f.is_dir()]
-        folders = sorted(folders, key=pather, reverse=False)
+    # plots that use all runs parse them up front, with multiple jobs in one pool for all explorations
+    # (methods parsed on first access only fan out over the files of one method folder)
+    if load:
+        corpus.load()
 
-        # get data from input folders
-        data: ExplorationData = {}
-        counter: int = 0
-        for (name, path) in folders:
-            data[name] = (counter, process_subfolder_fully(path))
-            counter += 1
-
-        multiple_data[exploration[0]] = data 
+    multiple_data: MultipleExplorationData = corpus # type: ignore
 
     return multiple_data
 
 @staticmethod
-def get_data_fully(input: str) -> ExplorationData:
+def get_data_fully(input: str, jobs: int = 1, columns: List[str] | None = None) -> ExplorationData:
 
-    # get sub folders from input folder
-    folders: list[tuple[str, str]] = [(f.name, f.path) for f in os.scandir(input) if f.is_dir()]
-    folders = sorted(folders, key=pather, reverse=False)
+    # imported here, the corpus itself builds on this module
+    import exploration_corpus
 
-    # get data from input folders
-    data: ExplorationData = {}
-    counter: int = 0
-    for (name, path) in folders:
-        data[name] = (counter, process_subfolder_fully(path))
-        counter += 1
+    # index the method folders, runs are parsed on first access
+    # only the given columns are parsed (runtime and validity are always included)
+    data: ExplorationData = exploration_corpus.index_exploration(exploration_dataset.resolve_exploration(input), jobs, columns)
 
     return data
 
 
 @staticmethod
-def process_subfolder_fully(sub_folder: str) -> MethodData:
-    files: list[str] = os.listdir(sub_folder + "/" + "csv")
-    files = sorted(files, reverse=False)
+def process_subfolder_fully(sub_folder: str, columns: List[str] | None = None) -> MethodData:
+    files: list[str] = list_runs(sub_folder)
 
     fileData: MethodData = {}
     for f in files:
-        if (f[-3:] == 'csv'):
-            fileData[f] = process_file_fully(sub_folder + "/" + "csv", f)
+        fileData[f] = process_file_fully(get_run_folder(sub_folder), f, columns)
 
     return fileData
 
 
 @staticmethod
-def process_file_fully(sub_folder: str, file: str) -> List[Dict[str, str]]:
-    ifd = open(str(sub_folder + '/' + file), mode='r')
+def list_folders(input: str) -> List[Tuple[str, str]]:
 
-    csv_reader = csv.reader(ifd, delimiter=',')
-    header: list[str]= next(csv_reader)
+    # partitions of a converted dataset keep the order of the original tree
+    partitions: List[Tuple[str, str]] | None = exploration_dataset.list_folders(input)
+    if partitions is not None:
+        return partitions
 
-    # create list of dicts
-    data: List[Dict[str, str]] = []
+    # sub folders sorted by their generation time, converted (or partially converted) datasets are skipped
+    folders: List[Tuple[str, str]] = [(f.name, f.path) for f in os.scandir(input)
+                                      if f.is_dir() and not exploration_dataset.is_dataset(f.path) and not exploration_dataset.is_partial(f.path)]
 
-    limiter = 0
-    for line in csv_reader:
-        limiter += 1
+    return sorted(folders, key=pather, reverse=False)
 
-        # TODO check this 
-        if limiter > 500000: 
-            break
-        entry_index = 0
-        line_dict: Dict[str, str] = {}
 
-        # TODO check what is going on here 
-        for entry in header:
-            # convert to float if possible?
-            line_dict[entry] = line[entry_index]
-            entry_index += 1
+@staticmethod
+def list_run_files(input: str) -> List[Tuple[str, str, str]]:
 
-        data.append(line_dict)
+    # (method, run, path) of all runs of an exploration, in the order used by all plots
+    runs: List[Tuple[str, str, str]] = []
+    for (name, path) in list_folders(exploration_dataset.resolve_exploration(input)):
+        for f in list_runs(path):
+            runs.append((name, f, os.path.normpath(get_run_folder(path) + "/" + f)))
 
-    return data
+    return runs
+
+
+@staticmethod
+def get_run_folder(sub_folder: str) -> str:
+    # runs of a method folder are in its csv folder, runs of a dataset partition in the partition
+    if exploration_dataset.list_runs(sub_folder) is not None:
+        return sub_folder
+
+    return sub_folder + "/" + "csv"
+
+
+@staticmethod
+def list_runs(sub_folder: str) -> List[str]:
+
+    # names of the csv files of a method folder (also for dataset partitions)
+    runs: List[str] | None = exploration_dataset.list_runs(sub_folder)
+    if runs is not None:
+        return runs
+
+    # typed runs (e.g. arrow ipc files) are listed by the name of their csv file
+    files: List[str] = [f for f in os.listdir(sub_folder + "/" + "csv") if f[-3:] == 'csv']
+    return sorted(set(files + exploration_dataset.list_stored_runs(sub_folder + "/" + "csv")))
+
+
+@staticmethod
+def process_file_fully(sub_folder: str, file: str, columns: List[str] | None = None) -> RunData:
+    path: str = os.path.normpath(str(sub_folder + '/' + file))
+
+    # files are loaded only once per process, e.g. for batch plotting
+    # load again if columns are requested that are not projected yet
+    if not is_loaded(path, columns):
+        columns = merge_projections(loaded_projections.get(path, []), columns)
+        loaded_files[path] = load_file(path, columns)
+        loaded_projections[path] = columns
+
+    return loaded_files[path]
+
+
+@staticmethod
+def is_loaded(path: str, columns: List[str] | None) -> bool:
+    if path not in loaded_files:
+        return False
+
+    # None is the projection to all columns
+    loaded: List[str] | None = loaded_projections[path]
+    return loaded is None or (columns is not None and all([name in loaded for name in columns]))
+
+
+@staticmethod
+def merge_projections(first: List[str] | None, second: List[str] | None) -> List[str] | None:
+    if first is None or second is None:
+        return None
+
+    return sorted(set(first) | set(second))
+
+
+@staticmethod
+def load_files(sub_folders: List[str], jobs: int, columns: List[str] | None = None) -> None:
+
+    # collect csv files of all sub folders that are not loaded yet 
+    paths: List[str] = []
+    for sub_folder in sub_folders:
+        for f in list_runs(sub_folder):
+            path: str = os.path.normpath(get_run_folder(sub_folder) + "/" + f)
+            # memory mapped runs are loaded on first access, without copies from worker processes
+            if not is_loaded(path, columns) and not exploration_dataset.is_memory_mapped(path):
+                paths.append(path)
+
+    # without multiple jobs, files are loaded on first access 
+    if jobs <= 1 or len(paths) <= 1:
+        return None
+
+    projections: List[List[str] | None] = [merge_projections(loaded_projections.get(path, []), columns) for path in paths]
+
+    # parse files in worker processes, map keeps the order of the paths 
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for (path, projection, table) in zip(paths, projections, executor.map(load_file, paths, projections)):
+            loaded_files[path] = table
+            loaded_projections[path] = projection
+
+    return None
+
+
+# no staticmethod, has to be picklable for worker processes 
+def load_file(path: str, columns: List[str] | None = None) -> RunData:
+
+    # typed runs (converted datasets, arrow ipc files) are read directly
+    stored: str | None = exploration_dataset.get_stored_path(path)
+    if stored is not None:
+        return exploration_dataset.read_run(stored, columns)
+
+    # reuse parsed data if the file has not changed
+    table: RunData | None = exploration_cache.load(path, columns)
+    if table is None:
+
+        # keep the columns that are already cached, so projections extend the cache entry
+        if columns is not None:
+            columns = merge_projections(exploration_cache.get_columns(path), columns)
+
+        table = parse_file_fully(path, columns)
+        exploration_cache.store(path, table, read_header(path))
+
+    return table
+
+
+@staticmethod
+def parse_file_fully(path: str, columns: List[str] | None = None) -> RunData:
+
+    # parse with the fastest available backend (pyarrow, numpy)
+    header: List[str] = read_header(path)
+    table: RunData | None = csv_backends.parse(path, header, project(header, columns))
+    if table is not None:
+        return table
+
+    # fallback, parse in chunks, so only one chunk of rows is kept as strings at a time
+    return ExplorationTable.concatenate(list(read_csv_chunks(path, columns=columns)))
+
+
+@staticmethod
+def read_header(path: str) -> List[str]:
+    with open(path, mode='r') as ifd:
+        return next(csv.reader(ifd, delimiter=','))
+
+
+@staticmethod
+def read_file_chunks(path: str, size: int = chunk_size, columns: List[str] | None = None) -> Iterator[RunData]:
+
+    # cached files are memory mapped, chunks are views on the mapped columns
+    table: RunData | None = None
+    if is_loaded(os.path.normpath(path), columns):
+        table = loaded_files[os.path.normpath(path)]
+    elif exploration_dataset.get_stored_path(path) is not None:
+        table = load_file(path, columns)
+    else:
+        table = exploration_cache.load(path, columns)
+
+    # without a cache entry, parse with a fast backend (pyarrow, numpy) and cache the table for later runs
+    # typed columns are compact, only the csv module fallback below has to stream to bound the memory
+    if table is None and csv_backends.select_backend() in csv_backends.backends:
+        header: List[str] = read_header(path)
+
+        # keep the columns that are already cached, so projections extend the cache entry
+        projection: List[str] | None = merge_projections(exploration_cache.get_columns(path), columns) if columns is not None else None
+        table = csv_backends.parse(path, header, project(header, projection))
+        if table is not None:
+            exploration_cache.store(path, table, header)
+
+    if table is not None:
+        for start in range(0, max(len(table), 1), size):
+            yield table[start:start + size]
+        return None
+
+    yield from read_csv_chunks(path, size, columns)
+
+    return None
+
+
+@staticmethod
+def read_csv_chunks(path: str, size: int = chunk_size, columns: List[str] | None = None) -> Iterator[RunData]:
+
+    # yield batches of at most size samples, memory is bounded by the batch size
+    with open(path, mode='r') as ifd:
+        csv_reader = csv.reader(ifd, delimiter=',')
+        header: list[str] = next(csv_reader)
+
+        # columns that are not projected are never decoded
+        selected: List[str] = project(header, columns)
+
+        # always yield at least one (possibly empty) batch
+        rows: List[List[str]] = list(itertools.islice(csv_reader, size))
+        yield ExplorationTable.from_rows(header, rows, selected)
+
+        while len(rows) == size:
+            rows = list(itertools.islice(csv_reader, size))
+            if len(rows) > 0:
+                yield ExplorationTable.from_rows(header, rows, selected)
+
+    return None
 
 
 @staticmethod
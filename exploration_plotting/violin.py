@@ -14,7 +14,7 @@ import numpy as np
 @staticmethod
 def violin(plotting_configuration: PlottingConfiguration) -> None:
 
-    exploration_data: util.ExplorationDataRuntime = util.get_data(plotting_configuration.input)
+    exploration_data: util.ExplorationDataRuntime = util.get_data(plotting_configuration.input, plotting_configuration.jobs)
     violin_full(exploration_data=exploration_data, 
                 plotting_configuration=plotting_configuration
                 )
@@ -61,6 +61,5 @@ def violin_full(exploration_data: util.ExplorationDataRuntime, plotting_configur
     if plotting_configuration.log:
         log_appendix = "_log"
 
-    plt.savefig( # type: ignore
-        f"{plotting_configuration.output}/{plotting_configuration.name}_violin_speedup{log_appendix}.{plotting_configuration.format}",
-        dpi=plotting_configuration.dpi)
+    plotting_configuration.savefig(
+        f"{plotting_configuration.output}/{plotting_configuration.name}_violin_speedup{log_appendix}.{plotting_configuration.format}")
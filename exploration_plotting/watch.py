@@ -0,0 +1,220 @@
+#!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    List,
+    Dict,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+if TYPE_CHECKING:
+    from plotting_configuration import PlottingConfiguration
+
+import csv
+import io
+import os
+import time
+
+from matplotlib import pyplot as plt
+from matplotlib.ticker import FuncFormatter
+import numpy as np
+
+import util
+import performance_evolution_kernel
+from exploration_table import ExplorationTable
+
+# live view on explorations that are still running
+# csv files are tailed from the last byte offset, only new rows are parsed
+
+
+class FileTail:
+    """
+    Incremental reader for a growing csv file of a running exploration.
+    Keeps the running minimum and aggregates of all rows read so far.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self.reset()
+
+    def reset(self) -> None:
+        # position after the last complete line that was read
+        self.offset: int = 0
+        self.header: List[str] | None = None
+
+        # aggregates of all rows read so far
+        self.running: performance_evolution_kernel.RunningMinimum = performance_evolution_kernel.RunningMinimum()
+        self.valid: int = 0
+
+        # the performance evolution only changes at a new minimum
+        # keep these steps instead of one value per sample
+        self.steps_x: List[int] = []
+        self.steps_y: List[float] = []
+
+    @property
+    def samples(self) -> int:
+        return self.running.count
+
+    def read(self) -> int:
+
+        # file was deleted or rotated, no new rows until it is written again
+        try:
+            size: int = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+        # file was truncated or replaced, start from the beginning
+        if size < self.offset:
+            self.reset()
+
+        if size == self.offset:
+            return 0
+
+        try:
+            with open(self.path, mode='rb') as ifd:
+                ifd.seek(self.offset)
+                content: bytes = ifd.read(size - self.offset)
+        except FileNotFoundError:
+            return 0
+
+        # only consume complete lines, the last line might still be written
+        end: int = content.rfind(b'\n') + 1
+        if end == 0:
+            return 0
+        self.offset += end
+
+        rows: List[List[str]] = list(csv.reader(io.StringIO(content[:end].decode())))
+        if self.header is None:
+            self.header = rows[0]
+            rows = rows[1:]
+
+        rows = [row for row in rows if len(row) > 0]
+        if len(rows) > 0:
+            self.update(ExplorationTable.from_rows(self.header, rows))
+
+        return len(rows)
+
+    def update(self, chunk: util.RunData) -> None:
+
+        invalid: np.ndarray = util.get_invalid(chunk)
+        start: int = self.running.count
+        pe: np.ndarray = self.running.update(chunk.runtime, invalid)
+        self.valid += int(np.sum(~invalid))
+
+        # positions where the performance evolution improves
+        # (NaN before the first valid sample)
+        previous: np.ndarray = np.append(self.steps_y[-1:] if len(self.steps_y) > 0 else [np.inf], pe[:-1])
+        previous[np.isnan(previous)] = np.inf
+        improved: np.ndarray = np.flatnonzero(pe < previous)
+
+        self.steps_x += (improved + start).tolist()
+        self.steps_y += pe[improved].tolist()
+
+        return None
+
+    def get_steps(self) -> Tuple[np.ndarray, np.ndarray]:
+        # steps of the performance evolution, extended to the last sample
+        if len(self.steps_x) == 0:
+            return (np.zeros(0), np.zeros(0))
+
+        return (np.append(self.steps_x, self.samples - 1), np.append(self.steps_y, self.steps_y[-1]))
+
+
+@staticmethod
+def watch(plotting_configuration: PlottingConfiguration) -> None:
+
+    tails: Dict[str, Dict[str, FileTail]] = {}
+
+    print(f"watching {plotting_configuration.input} (refresh every {plotting_configuration.watch}s, stop with ctrl-c)")
+    try:
+        while True:
+            if refresh(tails, plotting_configuration.input) > 0:
+                render(plotting_configuration, tails)
+                report(tails)
+
+            time.sleep(plotting_configuration.watch)
+
+    except KeyboardInterrupt:
+        pass
+
+    return None
+
+
+@staticmethod
+def refresh(tails: Dict[str, Dict[str, FileTail]], input: str) -> int:
+
+    # pick up new method folders and csv files, then read new rows of all files
+    folders: List[Tuple[str, str]] = [(f.name, f.path) for f in os.scandir(input) if f.is_dir()]
+    folders = sorted(folders, key=util.pather, reverse=False)
+
+    new_rows: int = 0
+    for (name, path) in folders:
+        if not os.path.isdir(path + "/" + "csv"):
+            continue
+
+        method_tails: Dict[str, FileTail] = tails.setdefault(name, {})
+        for f in sorted(os.listdir(path + "/" + "csv")):
+            if f[-3:] == 'csv' and f not in method_tails:
+                method_tails[f] = FileTail(path + "/" + "csv" + "/" + f)
+
+        for f in method_tails:
+            new_rows += method_tails[f].read()
+
+    return new_rows
+
+
+@staticmethod
+def render(plotting_configuration: PlottingConfiguration, tails: Dict[str, Dict[str, FileTail]]) -> None:
+
+    fig, ax = plt.subplots(figsize=(5, 5)) # type: ignore
+
+    counter: int = 0
+    for method in tails:
+        for run in tails[method]:
+            (x, y) = tails[method][run].get_steps()
+
+            # create plot, one step for each new minimum
+            ax.plot(x, # type: ignore
+                    performance_evolution_kernel.transform(y, log=plotting_configuration.log, unit=plotting_configuration.unit),
+                    alpha=0.9,
+                    color=util.colors[counter % len(util.colors)],
+                    lw=1,
+                    drawstyle='steps-post',
+                    label=f"{method}_{run[:-4]}"
+                    )
+
+        counter += 1
+
+    # assemble plot
+    ax.set_title(f"{plotting_configuration.name} - Performance Evolution (live)", fontsize=plotting_configuration.fontsize) # type: ignore
+    ax.set_xlabel("Samples") # type: ignore
+    ax.set_ylabel("Runtime (ms)") # type: ignore
+    ax.set_yscale('log') # type: ignore
+    ax.yaxis.set_major_formatter(FuncFormatter(util.log_formatter)) # type: ignore
+    ax.legend() # type: ignore
+
+    fig.tight_layout() # type: ignore
+
+    # save to file
+    log_appendix: str = ""
+    if plotting_configuration.log:
+        log_appendix = "_log"
+
+    plotting_configuration.savefig(
+        f"{plotting_configuration.output}/{plotting_configuration.name}_watch{log_appendix}.{plotting_configuration.format}", figure=fig)
+    plt.close(fig)
+
+    return None
+
+
+@staticmethod
+def report(tails: Dict[str, Dict[str, FileTail]]) -> None:
+
+    print(time.strftime("%H:%M:%S"))
+    for method in tails:
+        for run in tails[method]:
+            tail: FileTail = tails[method][run]
+            print(f"    {method}/{run}: samples: {tail.samples}, valid: {tail.valid}, minimum: {tail.running.minimum} (sample {tail.running.index})")
+
+    return None
@@ -3,12 +3,14 @@ from __future__ import annotations
 
 import util
 
+# shared with exploration_plotting (installed package)
+from exploration_plotting import performance_evolution_kernel
+
 import plotly.graph_objects as go # type: ignore
 from matplotlib import pyplot as plt
 from matplotlib.ticker import FuncFormatter
 
 import numpy as np
-from scipy.stats import sem # type: ignore
 
 from typing import (
     List,
@@ -33,7 +35,7 @@ def order_ranges(plotting_configuration: PlottingConfiguration) -> None:
 def order_ranges_grouped(plotting_configuration: PlottingConfiguration) -> None:
 
     print("processing data")
-    experiment_data: util.ExperimentData = util.get_data(plotting_configuration.input)
+    experiment_data: util.ExperimentData = util.get_data(plotting_configuration.input, plotting_configuration.jobs)
     print("finished in")
 
     for benchmark in experiment_data:
@@ -75,32 +77,21 @@ def order_ranges_grouped(plotting_configuration: PlottingConfiguration) -> None:
                 order_count += 1
 
                 # collect runtimes and convert to performance evolution
-                tuning_runs: List[List[float]] = []
+                tuning_runs_pe: List[np.ndarray] = []
                 for tuning_run in order[method]:
-                    tuning_run_runtimes: List[float] = []
-                    minimum: float = tuning_run[0].runtime
-                    for sample in tuning_run:
-                        if sample.runtime < minimum:
-                            minimum = sample.runtime
-                        tuning_run_runtimes.append(minimum)
-                    
-                    tuning_runs.append(tuning_run_runtimes)
-
-                # collect means and confidence intervals
-                means: List[float] = [] 
-                confidence: List[float] = []
-
-                # be careful here -> will fail if not all runs have the same length
-                for i in range(len(tuning_runs[0])):
-
-                    # group all runs at position i 
-                    runs_at_position: List[float] = [run[i] for run in tuning_runs]
+                    runtime: np.ndarray = tuning_run.runtime
+                    tuning_runs_pe.append(performance_evolution_kernel.performance_evolution(
+                        runtime=runtime,
+                        invalid=util.get_invalid(runtime),
+                        ))
 
-                    # compute mean for all runs at position i
-                    means.append(float(np.median(np.array(runs_at_position))))
+                # runs x samples, cut to the shortest run
+                tuning_runs: np.ndarray = performance_evolution_kernel.stack_runs(tuning_runs_pe)
 
-                    # compute confidence interval  
-                    confidence.append(sem(runs_at_position) * 1.96) 
+                # collect means and confidence intervals for all positions at once
+                aggregate: performance_evolution_kernel.RunsAggregate = performance_evolution_kernel.aggregate(tuning_runs)
+                means: List[float] = aggregate.median.tolist()
+                confidence: List[float] = (aggregate.sem * 1.96).tolist()
 
                 # cut off if limit is set
                 if plotting_configuration.limit is not None:
@@ -180,7 +171,7 @@ def order_ranges_grouped(plotting_configuration: PlottingConfiguration) -> None:
 
 def order_ranges_shadowed(plotting_configuration: PlottingConfiguration) -> None:
 
-    experiment_data: util.ExperimentData = util.get_data(plotting_configuration.input)
+    experiment_data: util.ExperimentData = util.get_data(plotting_configuration.input, plotting_configuration.jobs)
 
     for benchmark in experiment_data:
 
@@ -223,32 +214,21 @@ def order_ranges_shadowed(plotting_configuration: PlottingConfiguration) -> None
                 order_count += 1
 
                 # collect runtimes and convert to performance evolution
-                tuning_runs: List[List[float]] = []
+                tuning_runs_pe: List[np.ndarray] = []
                 for tuning_run in order[method]:
-                    tuning_run_runtimes: List[float] = []
-                    minimum: float = tuning_run[0].runtime
-                    for sample in tuning_run:
-                        if sample.runtime < minimum:
-                            minimum = sample.runtime
-                        tuning_run_runtimes.append(minimum)
-                    
-                    tuning_runs.append(tuning_run_runtimes)
-
-                # collect means and confidence intervals
-                means: List[float] = [] 
-                confidence: List[float] = []
-
-                # be careful here -> will fail if not all runs have the same length
-                for i in range(len(tuning_runs[0])):
-
-                    # group all runs at position i 
-                    runs_at_position: List[float] = [run[i] for run in tuning_runs]
-
-                    # compute mean for all runs at position i
-                    means.append(float(np.median(np.array(runs_at_position))))
-
-                    # compute confidence interval  
-                    confidence.append(sem(runs_at_position) * 1.96) 
+                    runtime: np.ndarray = tuning_run.runtime
+                    tuning_runs_pe.append(performance_evolution_kernel.performance_evolution(
+                        runtime=runtime,
+                        invalid=util.get_invalid(runtime),
+                        ))
+
+                # runs x samples, cut to the shortest run
+                tuning_runs: np.ndarray = performance_evolution_kernel.stack_runs(tuning_runs_pe)
+
+                # collect means and confidence intervals for all positions at once
+                aggregate: performance_evolution_kernel.RunsAggregate = performance_evolution_kernel.aggregate(tuning_runs)
+                means: List[float] = aggregate.median.tolist()
+                confidence: List[float] = (aggregate.sem * 1.96).tolist()
 
 
                 # TODO: use a better metric, not the last element 
@@ -16,7 +16,7 @@ if TYPE_CHECKING:
 @staticmethod
 def order_statistics(plotting_configuration: PlottingConfiguration) -> None:
 
-    experiment_data: util.ExperimentData = util.get_data(plotting_configuration.input)
+    experiment_data: util.ExperimentData = util.get_data(plotting_configuration.input, plotting_configuration.jobs)
 
     for benchmark in experiment_data:
 
@@ -33,7 +33,7 @@ def order_statistics(plotting_configuration: PlottingConfiguration) -> None:
             # compute entries with statistics for each method
             for method in order:
 
-                tuning_runs_result: list[float] = [min([sample.runtime for sample in tuning_run]) for tuning_run in order[method]]
+                tuning_runs_result: list[float] = [float(np.min(tuning_run.runtime)) for tuning_run in order[method]]
 
                 order_entry[f"{method}_mean"] = round(float(np.mean(tuning_runs_result)), 2)
                 order_entry[f"{method}_min"] = round(float(min(tuning_runs_result)), 2)
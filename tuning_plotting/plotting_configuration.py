@@ -25,6 +25,7 @@ class PlottingConfiguration:
         plotting_parser.add_argument('-l', '--log', action='store_true', help='Plot Log')
         plotting_parser.add_argument('-li', '--limit', type=int, help='Limit Plotting')
         plotting_parser.add_argument('-f', '--format', type=str, help='File format')
+        plotting_parser.add_argument('-j', '--jobs', type=int, default=1, help='Parallel Jobs for Loading')
 
         # parse args and initialize variables     
         args: argparse.Namespace = plotting_parser.parse_args()
@@ -55,6 +56,8 @@ class PlottingConfiguration:
         if args.log:
             self.log = True
 
+        self.jobs: int = max(1, args.jobs)
+
         # constant arguments
         self.figsize: tuple[int, int] = (8, 8)
         self.dpi = 1000
@@ -73,6 +76,7 @@ class PlottingConfiguration:
         log: {self.log}
         limit: {self.limit}
         file_format: {self.format}
+        jobs: {self.jobs}
         """
 
 # register plotting methods 
@@ -1,6 +1,15 @@
 #!/bin/python3.10
+from __future__ import annotations
+
+from typing import (
+    Iterator,
+    Sequence,
+)
+
 from dataclasses import dataclass
 
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+
 import csv
 import os
 import re
@@ -10,14 +19,117 @@ import numpy as np
 
 ParameterConfiguration = dict[str, float | tuple[float]]
 
-@dataclass
+@dataclass(slots=True)
 class TuningSample:
     parameter_configuration: ParameterConfiguration
     runtime: float # validity is encapsulated here
     timestamp: float
 
+
+class TuningRunArray:
+    """
+    Samples of one tuning run (one csv file) as arrays instead of one object per sample.
+    """
+
+    def __init__(self,
+                 runtime: np.ndarray,
+                 timestamp: np.ndarray,
+                 parameters: np.ndarray,
+                 parameter_names: list[str],
+                 permutations: dict[str, list[tuple[float]]],
+                 ) -> None:
+
+        # validity is encapsulated here, invalid samples have the maximum runtime
+        self.runtime: np.ndarray = runtime
+        self.timestamp: np.ndarray = timestamp
+
+        # samples x parameters, permutation parameters hold ids into their permutation table
+        self.parameters: np.ndarray = parameters
+        self.parameter_names: list[str] = parameter_names
+        self.permutations: dict[str, list[tuple[float]]] = permutations
+
+    def parameter(self, name: str) -> np.ndarray:
+        return self.parameters[:, self.parameter_names.index(name)]
+
+    def parameter_configuration(self, index: int) -> ParameterConfiguration:
+        # decode the parameters of one sample
+        configuration: ParameterConfiguration = {}
+        for (name, value) in zip(self.parameter_names, self.parameters[index].tolist()):
+            if name in self.permutations:
+                configuration[name] = self.permutations[name][int(value)]
+            else:
+                configuration[name] = value
+
+        return configuration
+
+    def sample(self, index: int) -> TuningSample:
+        return TuningSample(
+            parameter_configuration=self.parameter_configuration(index),
+            runtime=float(self.runtime[index]),
+            timestamp=float(self.timestamp[index]),
+        )
+
+    def take(self, indices: slice | np.ndarray) -> TuningRunArray:
+        # slices are views on the arrays, permutation tables are shared
+        return TuningRunArray(
+            runtime=self.runtime[indices],
+            timestamp=self.timestamp[indices],
+            parameters=self.parameters[indices],
+            parameter_names=self.parameter_names,
+            permutations=self.permutations,
+        )
+
+    def __len__(self) -> int:
+        return len(self.runtime)
+
+    def __getitem__(self, index: int | slice) -> TuningSampleView | TuningRunArray:
+        if isinstance(index, slice):
+            return self.take(index)
+
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError(f"sample index out of range: {index}")
+
+        return TuningSampleView(self, index)
+
+    def __iter__(self) -> Iterator[TuningSampleView]:
+        for index in range(len(self)):
+            yield TuningSampleView(self, index)
+
+    def __repr__(self) -> str:
+        return f"TuningRunArray(samples={len(self)}, parameters={self.parameter_names})"
+
+
+class TuningSampleView:
+    """
+    TuningSample-like view on a single sample of a tuning run array.
+    """
+
+    __slots__ = ('run', 'index')
+
+    def __init__(self, run: TuningRunArray, index: int) -> None:
+        self.run: TuningRunArray = run
+        self.index: int = index
+
+    @property
+    def runtime(self) -> float:
+        return float(self.run.runtime[self.index])
+
+    @property
+    def timestamp(self) -> float:
+        return float(self.run.timestamp[self.index])
+
+    @property
+    def parameter_configuration(self) -> ParameterConfiguration:
+        return self.run.parameter_configuration(self.index)
+
+    def __repr__(self) -> str:
+        return repr(self.run.sample(self.index))
+
+
 # this is a full csv file 
-TuningRun = list[TuningSample]
+TuningRun = TuningRunArray
 
 # this represents all repitions for a method 
 MethodData = list[TuningRun] 
@@ -31,6 +143,21 @@ BenchmarkData = list[OrderData]
 # this rerpesents all benchmarks for an experiment
 ExperimentData = dict[str, BenchmarkData]
 
+# typed runs (arrow ipc / feather v2), memory mapped instead of parsed
+ipc_suffixes: list[str] = ['.arrow', '.feather']
+
+# number of a tensor entry, e.g. tensor(4.)
+tensor_pattern: re.Pattern[str] = re.compile(r'\d+\.?\d*')
+
+# parsed permutations, shared by all runs
+permutation_cache: dict[str, tuple[float]] = {}
+
+# rows used to infer the kind of a parameter column
+parameter_kind_rows: int = 8
+
+# method folders parsed by worker processes, taken by process_order_folder
+loaded_methods: dict[str, MethodData] = {}
+
 # helper method to sort the folders based on a timestamp   
 @staticmethod
 def pather(folder: tuple[str, str]) -> float:
@@ -38,13 +165,13 @@ def pather(folder: tuple[str, str]) -> float:
 
 
 @staticmethod
-def get_data(input: str) -> ExperimentData:
+def get_data(input: str, jobs: int = 1) -> ExperimentData:
 
-    # get sub folders from input folder
-    folders: list[tuple[str, str]] = [(f.name, f.path) for f in os.scandir(input) if f.is_dir()]
+    # get sub folders from input folder, sorted by their generation time
+    folders: list[tuple[str, str]] = get_sub_folders(input)
 
-    # sort folders based on their generation time  
-    folders = sorted(folders, key=pather, reverse=False)
+    # parse all method folders at once, independent of their benchmark and order
+    load_method_folders([method_path for (_, benchmark_path) in folders for (_, order_path) in get_sub_folders(benchmark_path) for (_, method_path) in get_sub_folders(order_path)], jobs)
 
     # process experiment data 
     experiment_data: ExperimentData = {}
@@ -56,6 +183,15 @@ def get_data(input: str) -> ExperimentData:
     return experiment_data
 
 
+@staticmethod
+def get_sub_folders(folder: str) -> list[tuple[str, str]]:
+
+    # get sub folders, sorted by their generation time
+    folders: list[tuple[str, str]] = [(f.name, f.path) for f in os.scandir(folder) if f.is_dir()]
+
+    return sorted(folders, key=pather, reverse=False)
+
+
 @staticmethod
 def process_benchmark_folder(benchmark_folder: str) -> BenchmarkData:
 
@@ -64,10 +200,7 @@ def process_benchmark_folder(benchmark_folder: str) -> BenchmarkData:
     benchmark_data: BenchmarkData = []
 
     # get order subfolders from input folder
-    order_folders: list[tuple[str, str]] = [(f.name, f.path) for f in os.scandir(benchmark_folder) if f.is_dir()]
-
-    # sort folders based on their generation time  
-    order_folders = sorted(order_folders, key=pather, reverse=False)
+    order_folders: list[tuple[str, str]] = get_sub_folders(benchmark_folder)
 
     # process data 
     for (_, order_path) in order_folders:
@@ -84,18 +217,48 @@ def process_order_folder(order_folder: str) -> OrderData:
     order_data: OrderData = {}
 
     # get order subfolders from input folder
-    method_folders: list[tuple[str, str]] = [(f.name, f.path) for f in os.scandir(order_folder) if f.is_dir()]
+    method_folders: list[tuple[str, str]] = get_sub_folders(order_folder)
 
-    # sort folders based on their generation time  
-    method_folders = sorted(method_folders, key=pather, reverse=False)
-
-    # process data 
+    # process data, method folders might be parsed by worker processes already
     for (method_name, method_path) in method_folders:
-        order_data[method_name] = process_method_folder(method_path)
+        if method_path in loaded_methods:
+            order_data[method_name] = loaded_methods.pop(method_path)
+        else:
+            order_data[method_name] = process_method_folder(method_path)
 
     return order_data
 
 
+@staticmethod
+def load_method_folders(method_folders: list[str], jobs: int) -> None:
+
+    # without multiple jobs, method folders are processed during the walk
+    if jobs <= 1 or len(method_folders) <= 1:
+        return None
+
+    # one task per method folder, results are collected in order of completion
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures: dict[Future[MethodData], str] = dict([(executor.submit(load_method_folder, method_folder), method_folder) for method_folder in method_folders])
+        for (done, future) in enumerate(as_completed(futures), start=1):
+            loaded_methods[futures[future]] = future.result()
+            report_progress(done, len(method_folders))
+
+    return None
+
+
+# no staticmethod, has to be picklable for worker processes 
+def load_method_folder(method_folder: str) -> MethodData:
+    return process_method_folder(method_folder)
+
+
+@staticmethod
+def report_progress(done: int, total: int) -> None:
+    # single line, overwritten until all method folders are loaded
+    print(f"loading method folders: {done}/{total}", end='\n' if done == total else '\r', flush=True)
+
+    return None
+
+
 @staticmethod
 def process_method_folder(method_folder: str) -> MethodData:
 
@@ -104,73 +267,199 @@ def process_method_folder(method_folder: str) -> MethodData:
     # process files 
     files: list[str] = os.listdir(method_folder + "/" + "csv")
     for f in files:
-        if (f[-3:] == 'csv'):
+
+        # typed runs (ipc) are used instead of their csv file, unless the csv file is newer
+        ipc_path: str | None = get_ipc_path(method_folder + "/" + "csv" + "/" + f)
+        if (f[-3:] == 'csv' and ipc_path is None) or ipc_path == method_folder + "/" + "csv" + "/" + f:
             method_data.append(process_tuning_run(method_folder + "/" + "csv", f))
 
     return method_data
 
 
+@staticmethod
+def get_ipc_path(path: str) -> str | None:
+
+    # typed file used for a run, None if the run is read from its csv file
+    (stem, _) = os.path.splitext(path)
+    csv_path: str = stem + ".csv"
+    for suffix in ipc_suffixes:
+        if os.path.isfile(stem + suffix):
+            if not os.path.isfile(csv_path) or os.path.getmtime(stem + suffix) >= os.path.getmtime(csv_path):
+                return stem + suffix
+
+    return None
+
+
+@staticmethod
+def read_ipc_columns(path: str) -> dict[str, np.ndarray]:
+
+    # optional dependency, imported on first use
+    import pyarrow as pa
+
+    # columns of a memory mapped arrow ipc (feather) file
+    # numeric columns without missing values are zero-copy views on the mapping
+    # pages are shared through the page cache by all processes reading the file
+    table = pa.ipc.open_file(pa.memory_map(path, mode='r')).read_all()
+
+    columns: dict[str, np.ndarray] = {}
+    for name in table.schema.names:
+        column = table.column(name)
+        if column.num_chunks == 1:
+            columns[name] = column.chunk(0).to_numpy(zero_copy_only=False)
+        else:
+            columns[name] = column.to_numpy()
+
+    return columns
+
+
+@staticmethod
+def parse_parameter(value: str) -> float | tuple[float]:
+
+    # if parameter entry is written as tensor 
+    if "tensor" in value:
+        return float(tensor_pattern.search(value).group()) # type: ignore
+
+    # if parameter entry is a permutation
+    elif "(" in value[0]:
+        return intern_permutation(value)
+
+    return float(value)
+
+
+@staticmethod
+def intern_permutation(value: str) -> tuple[float]:
+    # each distinct permutation is parsed once, all runs share the tuple
+    if value not in permutation_cache:
+        permutation_cache[value] = ast.literal_eval(value)
+
+    return permutation_cache[value]
+
+
+@staticmethod
+def infer_parameter_kind(column: Sequence[str]) -> str:
+
+    # kind of a string column, given by its first entries
+    head: list[str] = [str(value) for value in column[:parameter_kind_rows]]
+    if len(head) > 0 and all(["tensor" in value for value in head]):
+        return "tensor"
+    if len(head) > 0 and all([len(value) > 0 and "(" in value[0] for value in head]):
+        return "permutation"
+
+    return "numeric"
+
+
+@staticmethod
+def decode_column(column: Sequence[str], kind: str) -> tuple[np.ndarray, list[tuple[float]] | None]:
+
+    # plain numbers are converted by numpy in one call
+    if kind == "numeric":
+        try:
+            return (np.array(column, dtype=np.float64), None)
+        except ValueError:
+            pass
+
+    # tensors and permutations repeat a few distinct values, decode each of them once
+    (distinct, inverse) = np.unique(np.asarray(column, dtype=str), return_inverse=True)
+    inverse = inverse.reshape(-1)
+
+    # entries of another kind are decoded one by one, same as parse_parameter
+    if kind == "tensor" and all(["tensor" in value for value in distinct.tolist()]):
+        numbers: np.ndarray = np.array([tensor_pattern.search(value).group() for value in distinct.tolist()], dtype=np.float64) # type: ignore
+        return (numbers[inverse], None)
+
+    values: list[float | tuple[float]] = [parse_parameter(value) for value in distinct.tolist()]
+
+    # permutations are stored as ids into a table of distinct permutations
+    if any([isinstance(value, tuple) for value in values]):
+        return (inverse.astype(np.float64), values) # type: ignore
+
+    return (np.array(values, dtype=np.float64)[inverse], None)
+
+
+@staticmethod
+def process_tuning_run_ipc(path: str) -> TuningRun:
+
+    columns: dict[str, np.ndarray] = read_ipc_columns(path)
+    header: list[str] = list(columns.keys())
+    runtime_index: int = get_runtime_index(header)
+
+    # invalid samples get the maximum runtime, same as for csv files
+    # without invalid samples the runtime stays a view on the mapping
+    runtime: np.ndarray = columns[header[runtime_index]]
+    invalid: np.ndarray = (runtime == -1) | (columns[header[runtime_index + 1]].astype(str) == 'False')
+    if np.any(invalid):
+        runtime = np.where(invalid, float(2147483647), runtime)
+
+    (parameters, permutations) = decode_parameters([columns[name] for name in header[:-2]], header[:-2])
+
+    return TuningRunArray(
+        runtime=runtime,
+        timestamp=columns[header[-1]],
+        parameters=parameters,
+        parameter_names=header[:-2],
+        permutations=permutations,
+    )
+
+
+@staticmethod
+def decode_parameters(columns: list[Sequence[str] | np.ndarray], names: list[str]) -> tuple[np.ndarray, dict[str, list[tuple[float]]]]:
+
+    # samples x parameters, numeric (typed) columns are used as they are
+    samples: int = len(columns[0]) if len(columns) > 0 else 0
+    parameters: np.ndarray = np.zeros((samples, len(names)), dtype=np.float64)
+    permutations: dict[str, list[tuple[float]]] = {}
+
+    for (index, (name, column)) in enumerate(zip(names, columns)):
+        if isinstance(column, np.ndarray) and column.dtype.kind in 'iuf':
+            parameters[:, index] = column
+            continue
+
+        # the kind of a column is inferred once, the column is decoded as a whole
+        (parameters[:, index], table) = decode_column(column, infer_parameter_kind(column))
+        if table is not None:
+            permutations[name] = table
+
+    return (parameters, permutations)
+
+
 @staticmethod
 def process_tuning_run(tuning_run: str, file: str) -> TuningRun:
 
+    # typed runs are memory mapped
+    if os.path.splitext(file)[1] in ipc_suffixes:
+        return process_tuning_run_ipc(str(tuning_run + '/' + file))
+
     # prepare processing 
-    ifd = open(str(tuning_run + '/' + file), mode='r') # type: ignore
-    csv_reader = csv.reader(ifd, delimiter=',')
-    header: list[str] = next(csv_reader)
+    with open(str(tuning_run + '/' + file), mode='r') as ifd:
+        csv_reader = csv.reader(ifd, delimiter=',')
+        header: list[str] = next(csv_reader)
+        rows: list[list[str]] = list(csv_reader)
+
     runtime_index: int = get_runtime_index(header)
 
-    # process csv file 
-    line_count: int = 0
-    data: TuningRun = []
-    for row in csv_reader:
-        # don't skip header
-        if line_count == -1:
-            # skip header
-            line_count += 1
-        else:
-            line_count += 1
-
-            # get parameter config
-            parameter_configuration: ParameterConfiguration = {}
-            for param in range(len(row[:-2])):
-
-
-                # if parameter entry is written as tensor 
-                if "tensor" in row[param]:
-                    number: float = float(re.search(r'\d+\.?\d*', row[param]).group()) # type: ignore
-                    parameter_configuration[header[param]] = number
-                
-                # if parameter entry is a permutation
-                elif "(" in row[param][0]:
-                    perm: tuple[float] = ast.literal_eval(row[param])
-                    parameter_configuration[header[param]] = perm
-                
-                else: 
-                    parameter_configuration[header[param]] = float(row[param])
-
-            # process runtimes 
-            if (str(row[runtime_index]) == '-1'):
-                data.append(TuningSample(
-                    parameter_configuration=parameter_configuration,
-                    runtime=float(2147483647),
-                    timestamp=float(row[-1])
-                ))
-
-            elif (str(row[runtime_index + 1]) == 'False'):
-                data.append(TuningSample(
-                    parameter_configuration=parameter_configuration,
-                    runtime=float(2147483647),
-                    timestamp=float(row[-1])
-                ))
-                
-            else:
-                data.append(TuningSample(
-                    parameter_configuration=parameter_configuration,
-                    runtime=float(row[runtime_index]),
-                    timestamp=float(row[-1])
-                ))
+    # transpose rows to columns
+    columns: list[Sequence[str]] = list(zip(*rows)) if len(rows) > 0 else [() for _ in header]
+
+    # process runtimes, invalid samples get the maximum runtime
+    invalid: list[bool] = [value == '-1' or valid == 'False' for (value, valid) in zip(columns[runtime_index], columns[runtime_index + 1])]
+    runtime: np.ndarray = np.array([float(2147483647) if is_invalid else float(value) for (value, is_invalid) in zip(columns[runtime_index], invalid)], dtype=np.float64)
+
+    # get parameter config, all columns except the last two
+    (parameters, permutations) = decode_parameters(columns[:-2], header[:-2])
 
-    return data
+    return TuningRunArray(
+        runtime=runtime,
+        timestamp=np.array(columns[-1], dtype=np.float64),
+        parameters=parameters,
+        parameter_names=header[:-2],
+        permutations=permutations,
+    )
+
+
+@staticmethod
+def get_invalid(runtime: np.ndarray) -> np.ndarray:
+    # invalid samples are stored with the maximum runtime
+    return runtime >= float(2147483647)
 
 
 @staticmethod
@@ -214,9 +503,9 @@ def get_global_range(benchmark_data: BenchmarkData) -> tuple[float, float]:
             method_performance_max: list[float] = []
             for tuning_run in order[method]:
                 # get min/max for this tuning run 
-                method_performance_min.append(min([sample.runtime for sample in tuning_run]))
+                method_performance_min.append(float(np.min(tuning_run.runtime)))
                 # for performance evolution we need the first default configuration, which might be better than the worst
-                method_performance_max.append(tuning_run[0].runtime)
+                method_performance_max.append(float(tuning_run.runtime[0]))
 
             # compare if mean of min/max is the new global min/max
             if(np.mean(method_performance_min)) < minimum: